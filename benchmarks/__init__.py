@@ -0,0 +1 @@
+"""Benchmarks that run against a local PostgreSQL given by DATABASE_URI."""
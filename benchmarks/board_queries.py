@@ -0,0 +1,168 @@
+"""Latency of the ticker board under randomized filter workloads.
+
+Usage:
+    uv run python -m benchmarks.board_queries --requests 500 --seed 0
+
+Every request draws a random search prefix, industries, exchanges, metric
+ranges and sort from the live screener table. The same workload then runs on:
+
+- inline: the old board query, with every value inlined into the SQL text
+- parameterized: `build_board_query`, whose statements the driver prepares once
+- memory: the in-memory screener snapshot, materializing every match
+- memory page: the same, materializing only the first board page
+
+p50, p99 and mean latency are printed per backend, with the number of distinct
+statements each SQL backend sent to PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import text
+
+from ourportfolios.utils.board_query import (
+    RANGE_COLUMNS,
+    SORT_COLUMNS,
+    build_board_query,
+)
+from ourportfolios.utils.database import fetch_records, read_sql_async
+from ourportfolios.utils.scheduler import db_settings
+from ourportfolios.utils.screener import SCREENER_TABLE
+from ourportfolios.utils.screener_engine import BOARD_COLUMNS, ScreenerSnapshot
+
+
+def random_workload(df, count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    industries = sorted(df["industry"].dropna().unique())
+    exchanges = sorted(df["exchange"].dropna().unique())
+    symbols = sorted(df["symbol"].dropna())
+    metrics = [c for c in RANGE_COLUMNS if c in df.columns and df[c].notna().any()]
+
+    workload = []
+    for _ in range(count):
+        ranges = {}
+        for metric in rng.sample(metrics, rng.randint(0, min(3, len(metrics)))):
+            low, high = sorted(rng.uniform(0.05, 0.95) for _ in range(2))
+            ranges[metric] = df[metric].quantile([low, high]).tolist()
+        workload.append(
+            {
+                "search_query": rng.choice(symbols)[: rng.randint(1, 3)]
+                if rng.random() < 0.3
+                else "",
+                "industries": rng.sample(industries, rng.randint(0, 3)),
+                "exchanges": rng.sample(exchanges, rng.randint(0, 1)),
+                "ranges": ranges,
+                "sort_by": rng.choice(SORT_COLUMNS),
+                "descending": rng.random() < 0.5,
+            }
+        )
+    return workload
+
+
+def inline_query(request: Dict[str, Any]) -> str:
+    """The board query as it used to be built, by string concatenation."""
+    conditions = []
+    if request["search_query"]:
+        conditions.append(f"symbol LIKE '{request['search_query']}%'")
+    if request["industries"]:
+        names = ", ".join(f"'{name}'" for name in request["industries"])
+        conditions.append(f"industry IN ({names})")
+    if request["exchanges"]:
+        names = ", ".join(f"'{name}'" for name in request["exchanges"])
+        conditions.append(f"exchange IN ({names})")
+    for column, (low, high) in request["ranges"].items():
+        conditions.append(f"{column} BETWEEN {low} AND {high}")
+
+    query = f"SELECT {', '.join(BOARD_COLUMNS)} FROM tickers.{SCREENER_TABLE}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    direction = "DESC" if request["descending"] else "ASC"
+    return query + f" ORDER BY {request['sort_by']} {direction}"
+
+
+async def run_inline(request: Dict[str, Any]) -> str:
+    query = inline_query(request)
+    await fetch_records(text(query))
+    return query
+
+
+async def run_parameterized(snapshot: ScreenerSnapshot, request: Dict[str, Any]) -> str:
+    symbols = None
+    if request["search_query"]:
+        matches = snapshot.ticker_index.search(request["search_query"])
+        symbols = snapshot.columns["symbol"][matches].tolist()
+    query, params = build_board_query(
+        symbols,
+        request["industries"],
+        request["exchanges"],
+        request["ranges"],
+        request["sort_by"],
+        request["descending"],
+    )
+    await fetch_records(query, params)
+    return query.text
+
+
+async def measure(run, workload) -> tuple[List[float], int]:
+    latencies, statements = [], set()
+    for request in workload:
+        started = time.perf_counter()
+        statements.add(await run(request))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, len(statements)
+
+
+def report(label: str, latencies: List[float], statements: int | None = None) -> None:
+    p50, p99 = np.percentile(latencies, [50, 99])
+    line = (
+        f"{label:<15}p50 {p50:9.3f} ms  p99 {p99:9.3f} ms  "
+        f"mean {statistics.fmean(latencies):9.3f} ms"
+    )
+    if statements is not None:
+        line += f"  {statements} statements"
+    print(line)
+
+
+async def benchmark(requests: int, seed: int, page_size: int) -> None:
+    df = await read_sql_async(f"SELECT * FROM tickers.{SCREENER_TABLE}")
+    workload = random_workload(df, requests, random.Random(seed))
+    print(f"{len(df)} screener rows, {requests} requests")
+    snapshot = ScreenerSnapshot.from_frame(df)
+
+    # Warm up the connection pool once, outside of the measurements
+    await fetch_records(text("SELECT 1"))
+    for label, run in (
+        ("inline", run_inline),
+        ("parameterized", functools.partial(run_parameterized, snapshot)),
+    ):
+        latencies, statements = await measure(run, workload)
+        report(label, latencies, statements)
+
+    for label, run in (
+        ("memory", lambda request: snapshot.filter(**request)),
+        ("memory page", lambda request: snapshot.page(page_size, **request)),
+    ):
+        latencies = []
+        for request in workload:
+            started = time.perf_counter()
+            run(request)
+            latencies.append((time.perf_counter() - started) * 1000)
+        report(label, latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--page-size", type=int, default=db_settings.board_page_size)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.requests, args.seed, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
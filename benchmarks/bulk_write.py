@@ -0,0 +1,88 @@
+"""Compare DataFrame.to_sql with the COPY based bulk writer.
+
+Usage:
+    uv run python -m benchmarks.bulk_write --rows 50000 --repeat 3
+
+Both paths write the same synthetic news-like frame into a scratch `bench`
+schema of the database given by DATABASE_URI.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from ourportfolios.utils.load_data import bulk_write_df
+from ourportfolios.utils.scheduler import db_settings
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    symbols = [f"T{i:03d}" for i in range(1700)]
+    df = pd.DataFrame(
+        {
+            "symbol": rng.choice(symbols, rows),
+            "title": [f"Headline number {i}, with a comma" for i in range(rows)],
+            "publish_date": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 365 * 24, rows), unit="h"),
+            "price_change_ratio": rng.normal(0, 2, rows).round(2),
+            "volume": rng.integers(0, 10_000_000, rows),
+        }
+    )
+    df.loc[df.sample(frac=0.05, random_state=0).index, "price_change_ratio"] = np.nan
+    return df
+
+
+def time_it(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    engine = db_settings.conn
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE SCHEMA IF NOT EXISTS bench"))
+
+    def to_sql():
+        with engine.begin() as connection:
+            df.to_sql(
+                "to_sql_df",
+                connection,
+                schema="bench",
+                if_exists="replace",
+                index=False,
+            )
+
+    def copy():
+        with engine.begin() as connection:
+            bulk_write_df(df, "copy_df", connection, schema="bench")
+
+    to_sql_seconds = time_it(to_sql, args.repeat)
+    copy_seconds = time_it(copy, args.repeat)
+
+    print(f"rows: {args.rows:,} (best of {args.repeat})")
+    print(
+        f"to_sql : {to_sql_seconds:8.3f}s  {args.rows / to_sql_seconds:12,.0f} rows/s"
+    )
+    print(f"COPY   : {copy_seconds:8.3f}s  {args.rows / copy_seconds:12,.0f} rows/s")
+    print(f"speedup: {to_sql_seconds / copy_seconds:.1f}x")
+
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA bench CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
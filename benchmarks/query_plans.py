@@ -0,0 +1,127 @@
+"""Compare query plans of the read path with and without the declared schema.
+
+Usage:
+    uv run python -m benchmarks.query_plans --symbol FPT --repeat 5
+
+The tickers tables are copied without keys or indexes into a scratch `bench`
+schema, which is how `to_sql(if_exists="replace")` used to leave them. Every
+query then runs against both copies under EXPLAIN ANALYZE, and the plan's
+root node, scan types and best execution time are printed side by side.
+"""
+
+import argparse
+import json
+
+from sqlalchemy import text
+
+from ourportfolios.utils.schema import TICKERS_SCHEMA, get_column_types
+from ourportfolios.utils.scheduler import db_settings
+
+QUERIES = {
+    **{
+        f"company {table}": f"SELECT * FROM {{schema}}.{table} WHERE symbol = :symbol"
+        for table in (
+            "overview_df",
+            "shareholders_df",
+            "events_df",
+            "news_df",
+            "profile_df",
+            "officers_df",
+            "price_df",
+        )
+    },
+    "board": """
+        SELECT pb.symbol, pb.current_price, pb.accumulated_volume,
+            pb.pct_price_change, pd.company_name, od.market_cap
+        FROM {schema}.price_df AS pb
+        JOIN {schema}.profile_df AS pd ON pb.symbol = pd.symbol
+        JOIN {schema}.overview_df AS od ON pd.symbol = od.symbol
+        ORDER BY pb.accumulated_volume DESC
+    """,
+    "board from screener": """
+        SELECT symbol, current_price, accumulated_volume, pct_price_change,
+            company_name, market_cap
+        FROM {schema}.screener
+        ORDER BY accumulated_volume DESC
+    """,
+    "board by industry": """
+        SELECT pb.symbol, od.industry, od.market_cap
+        FROM {schema}.price_df AS pb
+        JOIN {schema}.overview_df AS od ON pb.symbol = od.symbol
+        WHERE od.industry = :industry
+    """,
+    "board by metric": """
+        SELECT pb.symbol, sd.pe, sd.roe
+        FROM {schema}.price_df AS pb
+        JOIN {schema}.stats_df AS sd ON pb.symbol = sd.symbol
+        WHERE sd.pe BETWEEN 5 AND 10
+        ORDER BY sd.roe DESC
+    """,
+}
+
+
+def scans(plan: dict) -> list[str]:
+    """Return the scan nodes of a plan, e.g. "Index Scan on overview_df"."""
+    found = []
+    if "Scan" in plan["Node Type"]:
+        found.append(f"{plan['Node Type']} on {plan.get('Relation Name', '?')}")
+    for child in plan.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+def explain(connection, query: str, params: dict, repeat: int) -> tuple[dict, float]:
+    best_plan, best_time = None, float("inf")
+    for _ in range(repeat):
+        output = connection.execute(
+            text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"), params
+        ).scalar_one()
+        if isinstance(output, str):
+            output = json.loads(output)
+        result = output[0]
+        if result["Execution Time"] < best_time:
+            best_plan, best_time = result["Plan"], result["Execution Time"]
+    return best_plan, best_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbol", default="FPT")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = db_settings.conn
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA IF EXISTS bench CASCADE"))
+        connection.execute(text("CREATE SCHEMA bench"))
+        for table in TICKERS_SCHEMA:
+            if get_column_types(connection, table, "tickers"):
+                connection.execute(
+                    text(f"CREATE TABLE bench.{table} AS SELECT * FROM tickers.{table}")
+                )
+                connection.execute(text(f"ANALYZE bench.{table}"))
+        industry = connection.execute(
+            text("SELECT industry FROM tickers.overview_df WHERE symbol = :symbol"),
+            {"symbol": args.symbol},
+        ).scalar()
+
+    params = {"symbol": args.symbol, "industry": industry}
+    try:
+        with engine.connect() as connection:
+            for name, query in QUERIES.items():
+                print(f"== {name}")
+                for label, schema in (("before", "bench"), ("after", "tickers")):
+                    plan, elapsed = explain(
+                        connection, query.format(schema=schema), params, args.repeat
+                    )
+                    print(
+                        f"  {label:<7}{elapsed:9.3f} ms  {plan['Node Type']}: "
+                        f"{', '.join(scans(plan))}"
+                    )
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP SCHEMA bench CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
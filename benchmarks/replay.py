@@ -0,0 +1,75 @@
+"""Profile the refresh pipeline and page loads against recorded data.
+
+Usage:
+    uv run python -m benchmarks.replay --record
+    uv run python -m benchmarks.replay --latency 0.2 --ticker FPT
+
+`--record` runs everything once against the live API and saves every frame
+under REPLAY_DIR. Without it, the frames are replayed from disk with the given
+synthetic latency per provider call, so no network is needed. The refresh jobs
+write to the database given by DATABASE_URI.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from ourportfolios.utils.load_data import load_historical_data
+from ourportfolios.utils.preprocessing.financial_statements import (
+    get_transformed_dataframes,
+)
+from ourportfolios.utils.providers import (
+    RecordingProvider,
+    ReplayProvider,
+    VnstockProvider,
+    set_provider,
+)
+from ourportfolios.utils.refresh_jobs import ordered_jobs
+from ourportfolios.utils.resilience import get_call_metrics
+from ourportfolios.utils.scheduler import db_settings
+
+
+def timed(label: str, fn) -> None:
+    started = time.perf_counter()
+    fn()
+    print(f"{label:<28}{time.perf_counter() - started:10.3f}s")
+
+
+def load_ticker_page(ticker: str) -> None:
+    """The provider calls of the ticker analysis page."""
+    tomorrow = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+    for interval, years in (("1D", 5), ("1W", 0), ("1M", 0)):
+        start = (date.today() - timedelta(days=365 * years)).strftime("%Y-%m-%d")
+        load_historical_data(ticker, start=start, end=tomorrow, interval=interval)
+    asyncio.run(get_transformed_dataframes(ticker))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--fixtures", default=db_settings.replay_dir)
+    parser.add_argument("--latency", type=float, default=db_settings.replay_latency)
+    parser.add_argument("--ticker", default="FPT")
+    args = parser.parse_args()
+
+    if args.record:
+        set_provider(RecordingProvider(VnstockProvider(), args.fixtures))
+    else:
+        set_provider(ReplayProvider(args.fixtures, latency=args.latency))
+
+    for job in ordered_jobs():
+        timed(f"refresh {job.name}", job.refresh)
+    timed(f"ticker page {args.ticker}", lambda: load_ticker_page(args.ticker))
+
+    print()
+    print(f"{'endpoint':<28}{'calls':>8}{'errors':>8}{'mean':>10}{'max':>10}")
+    for endpoint, metrics in sorted(get_call_metrics().items()):
+        print(
+            f"{endpoint:<28}{metrics['calls']:>8}{metrics['errors']:>8}"
+            f"{metrics['mean_latency']:>10.3f}{metrics['max_latency']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
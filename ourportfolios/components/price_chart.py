@@ -6,12 +6,15 @@ from dateutil.relativedelta import relativedelta
 import json
 
 from ..utils.compute_instrument import compute_ma, compute_rsi
-from ..utils.load_data import load_historical_data
+from ..utils.frame_cache import get_price_history
 
 
 # Price chart State
 class PriceChartState(rx.State):
-    df: pd.DataFrame = pd.DataFrame()
+    # Price histories stay in the shared frame cache, looked up by ticker and
+    # the end date of the ranges loaded
+    chart_ticker: str = ""
+    chart_end: str = ""
     selected_interval: str = "1D"
     selected_chart: str = "Candlestick"
     selected_ma_period: Dict[str, bool] = {}
@@ -26,11 +29,7 @@ class PriceChartState(rx.State):
         "200": "#3094FEB9",  # blue 8
     }
 
-    df_by_interval: Dict[str, Any] = {
-        "1D": pd.DataFrame(),
-        "1W": pd.DataFrame(),
-        "1M": pd.DataFrame(),
-    }
+    intervals: List[str] = ["1D", "1W", "1M"]
     # Date range for each interval
     interval_range: Dict[str, Any] = {
         "1D": date.today() - relativedelta(years=5),
@@ -43,25 +42,16 @@ class PriceChartState(rx.State):
     @rx.event
     def load_state(self):
         """Initialize chart with default settings"""
-        ticker: str = self.ticker
+        self.chart_ticker = self.ticker
+        self.chart_end = (date.today() + relativedelta(days=1)).strftime("%Y-%m-%d")
 
         # Fetch data for each interval. Time ranges are {
         #     1D: 3 years
         #     1W: 5 years (default)
         #     1M: all (default)
         # }
-        self.df_by_interval = {
-            i_range: load_historical_data(
-                symbol=ticker,
-                start=(self.interval_range[i_range]).strftime("%Y-%m-%d"),
-                end=(date.today() + relativedelta(days=1)).strftime("%Y-%m-%d"),
-                interval=i_range,
-            )
-            for i_range in self.df_by_interval.keys()
-        }
-
-        # Default range
-        self.df: pd.DataFrame = self.df_by_interval[self.selected_interval]
+        for interval in self.intervals:
+            self._frame(interval)
 
         # Loads MA options
         self.selected_ma_period = {item: False for item in self.ma_period.keys()}
@@ -69,16 +59,27 @@ class PriceChartState(rx.State):
         # Initialize chart
         yield from self.render_price_chart()
 
+    def _frame(self, interval: str | None = None) -> pd.DataFrame:
+        """Price history of an interval, the selected one by default."""
+        interval = interval or self.selected_interval
+        if not self.chart_ticker:
+            return pd.DataFrame()
+        return get_price_history(
+            self.chart_ticker,
+            interval,
+            start=(self.interval_range[interval]).strftime("%Y-%m-%d"),
+            end=self.chart_end,
+        )
+
     @rx.event
     def render_price_chart(self):
         yield rx.call_script(
-            f"""render_price_chart({self.chart_options}, {self.chart_data})"""
+            f"""render_price_chart({self.chart_options}, {self._chart_data()})"""
         )
 
     @rx.event
     def set_interval(self, _range):
         self.selected_interval = _range
-        self.df = self.df_by_interval[self.selected_interval]
 
         yield from self.render_price_chart()
 
@@ -103,36 +104,35 @@ class PriceChartState(rx.State):
             self.rsi_line = False
         yield from self.render_price_chart()
 
-    @rx.var
-    def ohlc_data(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _ohlc_data(df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Return a list of {time, open, high, low, close}"""
-        if self.df.empty:
+        if df.empty:
             return []
 
-        df2 = self.df.copy()
-        if "time" not in self.df.columns:
+        df2 = df.copy()
+        if "time" not in df.columns:
             df2 = df2.reset_index()
 
         df2["time"] = df2["time"].apply(lambda x: x.strftime("%Y-%m-%d"))
         return df2.to_dict("records")
 
-    @rx.var
-    def price_data(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _price_data(df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Return a list of {time, value } from 'close'"""
-        if (self.df.empty) or (not {"time", "close"}.issubset(self.df.columns)):
+        if (df.empty) or (not {"time", "close"}.issubset(df.columns)):
             return []
 
-        df2 = self.df[["time", "close"]].rename(columns={"close": "value"})
+        df2 = df[["time", "close"]].rename(columns={"close": "value"})
         df2["time"] = df2["time"].apply(lambda x: x.strftime("%Y-%m-%d"))
         return df2.dropna(how="any", axis=0).to_dict("records")
 
-    @rx.var
-    def ma_data(self) -> Dict[str, List[Dict[str, Any]]]:
+    def _ma_data(self, df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
         """If ma_period > 0, compute MA"""
-        if self.df.empty:
+        if df.empty:
             return {}
 
-        df2 = self.df.copy()
+        df2 = df.copy()
         if "time" not in df2.columns:
             df2 = df2.reset_index()
 
@@ -143,28 +143,29 @@ class PriceChartState(rx.State):
         }
         return ma_data
 
-    @rx.var
-    def rsi_data(self) -> List[Dict[str, Any]]:
+    def _rsi_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """If rsi_period > 0, compute RSI"""
-        if self.df.empty or not self.rsi_line:
+        if df.empty or not self.rsi_line:
             return []
 
-        df2 = self.df.copy()
+        df2 = df.copy()
         if "time" not in df2.columns:
             df2 = df2.reset_index()
         return compute_rsi(df2, self.rsi_period)
 
-    @rx.var
-    def chart_data(self) -> str:
+    def _chart_data(self) -> str:
         """Summarize chart data"""
+        df = self._frame()
         # Price
         price_data = (
-            self.ohlc_data if self.selected_chart == "Candlestick" else self.price_data
+            self._ohlc_data(df)
+            if self.selected_chart == "Candlestick"
+            else self._price_data(df)
         )
         # MA line
-        ma_line_data = self.ma_data
+        ma_line_data = self._ma_data(df)
         # RSI line
-        rsi_line_data = self.rsi_data
+        rsi_line_data = self._rsi_data(df)
 
         data: Dict[str, Any] = {
             "type": self.selected_chart,
@@ -28,7 +28,7 @@ def search_bar():
                     rx.flex(
                         rx.scroll_area(
                             rx.foreach(
-                                SearchBarState.get_suggest_ticker,
+                                SearchBarState.suggestions,
                                 lambda ticker_value: suggestion_card(
                                     value=ticker_value
                                 ),
@@ -52,7 +52,6 @@ def search_bar():
             ),
             position="relative",
             width="20vw",
-            on_mount=SearchBarState.load_state,
         ),
     )
 
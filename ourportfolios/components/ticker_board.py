@@ -4,6 +4,16 @@ import reflex as rx
 from ..state import TickerBoardState, CartState
 from ..components.graph import pct_change_badge
 
+BOARD_ROWS_ID = "ticker-board-rows"
+
+# Whether the board is scrolled within a screen of the end of its rows
+NEAR_END_SCRIPT = f"""
+(() => {{
+    const rows = document.getElementById("{BOARD_ROWS_ID}");
+    return rows.scrollTop + 2 * rows.clientHeight >= rows.scrollHeight;
+}})()
+"""
+
 
 def ticker_board():
     # Predefine card layout, use for both ticker info card's header and content
@@ -25,8 +35,8 @@ def ticker_board():
         rx.card(
             # Header
             ticker_basic_info_header(**card_layout),
-            # Ticker
-            rx.scroll_area(
+            # Ticker, loaded page by page as the user scrolls
+            rx.box(
                 rx.foreach(
                     TickerBoardState.get_all_tickers,
                     lambda value: ticker_card(
@@ -38,9 +48,23 @@ def ticker_board():
                         **card_layout,
                     ),
                 ),
+                rx.cond(
+                    TickerBoardState.total_tickers > TickerBoardState.visible_rows,
+                    rx.center(
+                        rx.button(
+                            "Load more",
+                            variant="soft",
+                            on_click=TickerBoardState.load_more_tickers,
+                        ),
+                        padding="1em",
+                    ),
+                ),
+                id=BOARD_ROWS_ID,
+                on_scroll=rx.call_script(
+                    NEAR_END_SCRIPT, callback=TickerBoardState.on_board_scroll
+                ).throttle(200),
                 paddingRight="0.6em",
-                type="hover",
-                scrollbars="vertical",
+                overflow_y="auto",
                 width="61em",
                 height="80vh",
             ),
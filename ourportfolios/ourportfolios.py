@@ -1,6 +1,7 @@
 import reflex as rx
 from contextlib import asynccontextmanager
 from .utils.scheduler import db_scheduler
+from .utils.load_data import catch_up_refresh_jobs
 
 # MUST BE IMPORTED!!!
 from .pages import landing, recommend, select, ticker_analysis, industry_analysis, analyze, compare  # noqa: F401
@@ -10,6 +11,7 @@ from .pages import landing, recommend, select, ticker_analysis, industry_analysi
 async def periodically_fetch_data():
     # Load data on initialize & keep fetching each 5 minutes
     db_scheduler.start()
+    catch_up_refresh_jobs()
 
     # Shut down the fetch on page shut down
     yield
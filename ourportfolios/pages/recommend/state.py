@@ -2,43 +2,10 @@
 
 import reflex as rx
 from typing import List, Dict, Any, cast
-import os
-import psycopg2
 from psycopg2.extras import RealDictCursor
 
 from ...state import GlobalFrameworkState
-
-DATABASE_URI = os.getenv("DATABASE_URI")
-
-
-def get_db_connection():
-    try:
-        if not DATABASE_URI:
-            print("WARNING: DATABASE_URI environment variable is not set")
-            return None
-        return psycopg2.connect(DATABASE_URI, cursor_factory=RealDictCursor)
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
-        return None
-
-
-def execute_query(query: str, params: tuple | None = None) -> List[Dict]:
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            print("WARNING: Cannot execute query - no database connection")
-            return []
-
-        with conn:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                if cur.description:
-                    results = cur.fetchall()
-                    return [dict(row) for row in results] if results else []
-                return []
-    except Exception as e:
-        print(f"Error executing query: {e}")
-        return []
+from ...utils.database import dbapi_connection, execute_query
 
 
 class FrameworkState(rx.State):
@@ -342,13 +309,8 @@ class FrameworkState(rx.State):
                 RETURNING id
             """
 
-            conn = get_db_connection()
-            if conn is None:
-                print("ERROR: Cannot submit framework - no database connection")
-                return
-
-            with conn:
-                with conn.cursor() as cur:
+            with dbapi_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute(
                         framework_query,
                         (
@@ -382,8 +344,6 @@ class FrameworkState(rx.State):
                                 ),
                             )
 
-                    conn.commit()
-
             self.close_add_dialog()
             await self.load_frameworks()
         except Exception as e:
@@ -2,9 +2,18 @@
 
 import reflex as rx
 
+from ...state import TickerBoardState
 from .state import State
 
 
+def facet_badge(value, counts) -> rx.Component:
+    """Badge of a checkbox filter value, with its number of matching tickers."""
+    return rx.badge(
+        value,
+        rx.text(counts.get(value, 0), color=rx.color("gray", 9)),
+    )
+
+
 def metric_slider(metric_tag: str, option: str):
     return rx.vstack(
         # Metric
@@ -130,7 +139,7 @@ def categorical_filter():
                     rx.foreach(
                         State.exchange_filter.items(),
                         lambda item: rx.checkbox(
-                            rx.badge(item[0]),
+                            facet_badge(item[0], TickerBoardState.exchange_counts),
                             checked=item[1],
                             on_change=lambda value: State.set_exchange(
                                 exchange=item[0], value=value
@@ -151,7 +160,7 @@ def categorical_filter():
                     rx.foreach(
                         State.industry_filter.items(),
                         lambda item: rx.checkbox(
-                            rx.badge(item[0]),
+                            facet_badge(item[0], TickerBoardState.industry_counts),
                             checked=item[1],
                             on_change=lambda value: State.set_industry(
                                 industry=item[0], value=value
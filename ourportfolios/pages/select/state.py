@@ -1,13 +1,12 @@
 """State management for the select page."""
 
 import reflex as rx
-import pandas as pd
 import asyncio
 
 from typing import List, Dict, Set
 
 from ...state import TickerBoardState
-from ...utils.scheduler import db_settings
+from ...utils.screener_engine import get_snapshot
 
 
 class State(rx.State):
@@ -104,40 +103,25 @@ class State(rx.State):
 
     # Set all metrics/options to their default setting
     @rx.event
-    def get_all_industries(self):
-        connection = None
+    async def get_all_industries(self):
         try:
-            with db_settings.conn.connect() as connection:
-                industries = pd.read_sql(
-                    "SELECT DISTINCT industry FROM tickers.overview_df;",
-                    connection,
-                )
-                self.industry_filter: Dict[str, bool] = {
-                    item: False for item in industries["industry"].tolist()
-                }
+            snapshot = await get_snapshot()
+            self.industry_filter: Dict[str, bool] = {
+                item: False for item in snapshot.categories.get("industry", [])
+            }
         except Exception as e:
             print(f"Database error: {e}")
             self.industry_filter: Dict[str, bool] = {}
 
     @rx.event
-    def get_all_exchanges(self):
+    async def get_all_exchanges(self):
         try:
-            with db_settings.conn.connect() as connection:
-                exchanges: pd.DataFrame = pd.read_sql(
-                    "SELECT DISTINCT exchange FROM tickers.overview_df;",
-                    connection,
-                )
-
-                self.exchange_filter: Dict[str, bool] = {
-                    item: False for item in exchanges["exchange"].tolist()
-                }
+            snapshot = await get_snapshot()
+            self.exchange_filter: Dict[str, bool] = {
+                item: False for item in snapshot.categories.get("exchange", [])
+            }
         except Exception as e:
             print(f"Database error: {e}")
-            if connection is not None:
-                try:
-                    connection.rollback()
-                except Exception:
-                    pass
             self.exchange_filter: Dict[str, bool] = {}
 
     @rx.event
@@ -260,7 +244,7 @@ class State(rx.State):
                 rx.run_in_thread(ticker_board_state.clear_all_filters),
                 rx.run_in_thread(self.get_technicals_default_value),
                 rx.run_in_thread(self.get_fundamentals_default_value),
-                rx.run_in_thread(self.get_all_industries),
-                rx.run_in_thread(self.get_all_exchanges),
+                self.get_all_industries(),
+                self.get_all_exchanges(),
             ]
             await asyncio.gather(*tasks)
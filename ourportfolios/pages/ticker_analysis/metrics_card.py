@@ -67,10 +67,7 @@ def key_metrics_card():
                     ),
                     value="statement",
                     padding_top="1em",
-                    on_mount=lambda: [
-                        State.load_financial_ratios(),
-                        State.load_transformed_dataframes(),
-                    ],
+                    on_mount=State.load_transformed_dataframes,
                 ),
                 default_value="performance",
                 width="100%",
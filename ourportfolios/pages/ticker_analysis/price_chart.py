@@ -26,7 +26,7 @@ def price_chart_card():
             rx.hstack(
                 rx.hstack(
                     rx.foreach(
-                        PriceChartState.df_by_interval.keys(),
+                        PriceChartState.intervals,
                         lambda item: rx.button(
                             item,
                             variant=rx.cond(
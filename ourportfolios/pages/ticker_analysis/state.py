@@ -3,13 +3,20 @@
 import pandas as pd
 import reflex as rx
 from typing import Any, List, Dict, Optional
-from vnstock import Finance
 
 from ...state.framework_state import GlobalFrameworkState
-from ...utils.load_data import fetch_company_data
+from ...utils.frame_cache import get_company_frames
 from ...utils.preprocessing.financial_statements import get_transformed_dataframes
 
 
+def first_row(df: pd.DataFrame) -> dict:
+    return {} if df.empty else df.iloc[0].to_dict()
+
+
+def records(df: pd.DataFrame) -> list[dict]:
+    return [] if df.empty else df.to_dict("records")
+
+
 class State(rx.State):
     switch_value: str = "year"
     company_control: str = "shares"
@@ -21,21 +28,18 @@ class State(rx.State):
         else:
             self.company_control = value
 
-    # Change to DataFrames
-    overview_df: pd.DataFrame = pd.DataFrame()
-    profile_df: pd.DataFrame = pd.DataFrame()
-    shareholders_df: pd.DataFrame = pd.DataFrame()
-    events_df: pd.DataFrame = pd.DataFrame()
-    news_df: pd.DataFrame = pd.DataFrame()
-    officers_df: pd.DataFrame = pd.DataFrame()
+    # Company tables, rendered from the DataFrames of the shared frame cache
+    overview: dict = {}
+    profile: dict = {}
+    shareholders: list[dict] = []
+    events: list[dict] = []
+    news: list[dict] = []
+    officers: list[dict] = []
 
-    price_data: pd.DataFrame = pd.DataFrame()
     income_statement: list[dict] = []
     balance_sheet: list[dict] = []
     cash_flow: list[dict] = []
 
-    financial_df: pd.DataFrame = pd.DataFrame()
-
     transformed_dataframes: dict = {}
     available_metrics_by_category: Dict[str, List[str]] = {}
     selected_metrics: Dict[str, str] = {}
@@ -68,14 +72,8 @@ class State(rx.State):
         """Called when page is unmounted - cleanup async operations."""
         self._is_mounted = False
         # Clear loaded data to stop any pending operations
-        self.overview_df = pd.DataFrame()
-        self.profile_df = pd.DataFrame()
-        self.shareholders_df = pd.DataFrame()
-        self.events_df = pd.DataFrame()
-        self.news_df = pd.DataFrame()
-        self.officers_df = pd.DataFrame()
+        self._set_company_data({})
         self.transformed_dataframes = {}
-        self.financial_df = pd.DataFrame()
         self._last_framework_id = None
 
     @rx.event
@@ -95,82 +93,27 @@ class State(rx.State):
             return
 
         try:
-            company_data = fetch_company_data(ticker)
+            company_data = await get_company_frames(ticker)
 
             # Check again after async operation
             if not self._is_mounted:
                 return
 
-            self.overview_df = company_data.get("overview", pd.DataFrame())
-            self.shareholders_df = company_data.get("shareholders", pd.DataFrame())
-            self.events_df = company_data.get("events", pd.DataFrame())
-            self.news_df = company_data.get("news", pd.DataFrame())
-            self.profile_df = company_data.get("profile", pd.DataFrame())
-            self.officers_df = company_data.get("officers", pd.DataFrame())
+            self._set_company_data(company_data)
         except Exception as e:
             print(f"Error loading company data: {e}")
-            # Set empty dataframes to allow page to continue loading
-            self.overview_df = pd.DataFrame()
-            self.shareholders_df = pd.DataFrame()
-            self.events_df = pd.DataFrame()
-            self.news_df = pd.DataFrame()
-            self.profile_df = pd.DataFrame()
-            self.officers_df = pd.DataFrame()
-
-    @rx.var(cache=True)
-    def overview(self) -> dict:
-        """Get overview as dict."""
-        if self.overview_df.empty:
-            return {}
-        return self.overview_df.iloc[0].to_dict()
-
-    @rx.var(cache=True)
-    def profile(self) -> dict:
-        """Get profile as dict."""
-        if self.profile_df.empty:
-            return {}
-        return self.profile_df.iloc[0].to_dict()
-
-    @rx.var(cache=True)
-    def shareholders(self) -> list[dict]:
-        """Get shareholders as list of dicts."""
-        if self.shareholders_df.empty:
-            return []
-        return self.shareholders_df.to_dict("records")
-
-    @rx.var(cache=True)
-    def events(self) -> list[dict]:
-        """Get events as list of dicts."""
-        if self.events_df.empty:
-            return []
-        return self.events_df.to_dict("records")
-
-    @rx.var(cache=True)
-    def news(self) -> list[dict]:
-        """Get news as list of dicts."""
-        if self.news_df.empty:
-            return []
-        return self.news_df.to_dict("records")
-
-    @rx.var(cache=True)
-    def officers(self) -> list[dict]:
-        """Get officers as list of dicts."""
-        if self.officers_df.empty:
-            return []
-        return self.officers_df.to_dict("records")
-
-    @rx.event
-    def load_financial_ratios(self):
-        """Load financial ratios data dynamically."""
-        ticker = self.ticker
-
-        report_range = self.switch_value
-        financial_df = Finance(symbol=ticker, source="VCI").ratio(
-            report_range=report_range, is_all=True
-        )
-        financial_df.columns = financial_df.columns.droplevel(0)
-
-        self.financial_df = financial_df
+            # Set empty data to allow page to continue loading
+            self._set_company_data({})
+
+    def _set_company_data(self, company_data: Dict[str, pd.DataFrame]):
+        """Render the company tables of a ticker into the state."""
+        empty = pd.DataFrame()
+        self.overview = first_row(company_data.get("overview", empty))
+        self.profile = first_row(company_data.get("profile", empty))
+        self.shareholders = records(company_data.get("shareholders", empty))
+        self.events = records(company_data.get("events", empty))
+        self.news = records(company_data.get("news", empty))
+        self.officers = records(company_data.get("officers", empty))
 
     @rx.event
     async def load_transformed_dataframes(self):
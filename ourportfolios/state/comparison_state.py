@@ -1,11 +1,21 @@
 """State for stock comparison functionality."""
 
 import reflex as rx
-import pandas as pd
 from sqlalchemy import text
 from typing import List, Dict, Any
 from collections import defaultdict
-from ..utils.scheduler import db_settings
+from ..utils.database import read_sql_async
+
+# Overview and screener stats of every compared ticker, in one query
+COMPARISON_QUERY = text("""
+    SELECT od.symbol, od.industry, od.market_cap,
+        sd.roe, sd.roa, sd.ev_ebitda, sd.dividend_yield, sd.gross_margin,
+        sd.net_margin, sd.doe, sd.alpha, sd.beta, sd.pe, sd.pb, sd.eps, sd.ps,
+        sd.rsi14
+    FROM tickers.overview_df AS od
+    JOIN tickers.stats_df AS sd ON od.symbol = sd.symbol
+    WHERE od.symbol = ANY(:symbols)
+""")
 
 
 class StockComparisonState(rx.State):
@@ -195,56 +205,21 @@ class StockComparisonState(rx.State):
     async def fetch_stocks_from_compare(self):
         """Fetch stock data for tickers in compare_list from database."""
         tickers = self.compare_list
-        stocks = []
-        if not tickers or not db_settings.conn:
+        if not tickers:
+            self.stocks = []
+            return
+
+        try:
+            df = await read_sql_async(COMPARISON_QUERY, {"symbols": tickers})
+        except Exception as e:
+            print(f"Error fetching data for {', '.join(tickers)}: {e}")
             self.stocks = []
             return
 
-        for ticker in tickers:
-            try:
-                overview_query = text(
-                    "SELECT symbol, industry, market_cap "
-                    "FROM tickers.overview_df WHERE symbol = :symbol"
-                )
-                overview_df = pd.read_sql(
-                    overview_query, db_settings.conn, params={"symbol": ticker}
-                )
-
-                stats_query = text(
-                    "SELECT symbol, roe, roa, ev_ebitda, dividend_yield, "
-                    "gross_margin, net_margin, doe, alpha, beta, pe, pb, eps, ps, rsi14 "
-                    "FROM tickers.stats_df WHERE symbol = :symbol"
-                )
-                stats_df = pd.read_sql(
-                    stats_query, db_settings.conn, params={"symbol": ticker}
-                )
-
-                if not overview_df.empty and not stats_df.empty:
-                    stock_data = {
-                        "symbol": ticker,
-                        "industry": overview_df.iloc[0]["industry"],
-                        "market_cap": overview_df.iloc[0]["market_cap"],
-                        "roe": stats_df.iloc[0]["roe"],
-                        "roa": stats_df.iloc[0]["roa"],
-                        "ev_ebitda": stats_df.iloc[0]["ev_ebitda"],
-                        "dividend_yield": stats_df.iloc[0]["dividend_yield"],
-                        "gross_margin": stats_df.iloc[0]["gross_margin"],
-                        "net_margin": stats_df.iloc[0]["net_margin"],
-                        "doe": stats_df.iloc[0]["doe"],
-                        "alpha": stats_df.iloc[0]["alpha"],
-                        "beta": stats_df.iloc[0]["beta"],
-                        "pe": stats_df.iloc[0]["pe"],
-                        "pb": stats_df.iloc[0]["pb"],
-                        "eps": stats_df.iloc[0]["eps"],
-                        "ps": stats_df.iloc[0]["ps"],
-                        "rsi14": stats_df.iloc[0]["rsi14"],
-                    }
-                    stocks.append(stock_data)
-            except Exception as e:
-                print(f"Error fetching data for {ticker}: {e}")
-                continue
-
-        self.stocks = stocks
+        # Keep the order of the compare list, dropping tickers without data
+        df = df.drop_duplicates(subset="symbol").set_index("symbol")
+        df = df.loc[[ticker for ticker in tickers if ticker in df.index]]
+        self.stocks = df.reset_index().to_dict("records")
 
     @rx.event
     async def import_and_fetch_compare(self):
@@ -1,38 +1,9 @@
 """Global framework state management for cross-page framework selection."""
 
 import reflex as rx
-import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from typing import Dict, List, Optional
 
-DATABASE_URI = os.getenv("DATABASE_URI")
-
-
-def get_db_connection():
-    if not DATABASE_URI:
-        print("WARNING: DATABASE_URI environment variable is not set")
-        return None
-    return psycopg2.connect(DATABASE_URI, cursor_factory=RealDictCursor)
-
-
-def execute_query(query: str, params: tuple | None = None) -> List[Dict]:
-    try:
-        conn = get_db_connection()
-        if conn is None:
-            print("WARNING: Cannot execute query - no database connection")
-            return []
-
-        with conn:
-            with conn.cursor() as cur:
-                cur.execute(query, params)
-                if cur.description:
-                    results = cur.fetchall()
-                    return [dict(row) for row in results] if results else []
-                return []
-    except Exception as e:
-        print(f"Database query error: {e}")
-        return []
+from ..utils.database import execute_query
 
 
 class GlobalFrameworkState(rx.State):
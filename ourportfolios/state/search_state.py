@@ -1,13 +1,10 @@
 """Search bar state for ticker search and suggestions."""
 
 import reflex as rx
-import time
 import asyncio
-import pandas as pd
-import itertools
-from sqlalchemy import text
 from typing import List, Dict, Any
-from ..utils.scheduler import db_settings
+from ..utils.screener_engine import get_snapshot
+from ..utils.suggestions import debounced_suggest
 
 
 class SearchBarState(rx.State):
@@ -15,103 +12,48 @@ class SearchBarState(rx.State):
 
     search_query: str = ""
     display_suggestion: bool = False
-    outstanding_tickers: Dict[str, Any] = {}
-    ticker_list: List[Dict[str, Any]] = []
+    suggestions: List[Dict[str, Any]] = []
 
     @rx.event
     def set_query(self, text: str = ""):
-        """Set search query text."""
-        self.search_query = text if text != "" else text
+        """Set search query text and look up its suggestions."""
+        self.search_query = text
+        return SearchBarState.update_suggestions
 
-    @rx.event
-    def set_display_suggestions(self, state: bool):
+    @rx.event(background=True)
+    async def set_display_suggestions(self, state: bool):
         """Toggle suggestion display with a delay."""
-        yield time.sleep(0.2)
-        self.display_suggestion = state
-
-    @rx.var
-    def get_suggest_ticker(self) -> List[Dict[str, Any]]:
-        """Get ticker suggestions based on search query."""
-        if not self.display_suggestion:
-            return []
-        if self.search_query == "":
-            return self.ticker_list
-
-        # Try exact match first
-        result: pd.DataFrame = self.fetch_ticker(
-            match_conditions="pb.symbol LIKE :pattern",
-            params={"pattern": f"{self.search_query}%"},
-        )
-
-        # Try permutations if no match
-        if result.empty:
-            combos: List[tuple] = list(
-                itertools.permutations(list(self.search_query), len(self.search_query))
-            )
-            all_combination = {
-                f"pattern_{idx}": f"{''.join(combo)}%"
-                for idx, combo in enumerate(combos)
-            }
-            result: pd.DataFrame = self.fetch_ticker(
-                match_conditions=" OR ".join(
-                    [
-                        f"pb.symbol LIKE :pattern_{i}"
-                        for i in range(len(all_combination))
-                    ]
-                ),
-                params=all_combination,
-            )
-
-        # Fallback to first letter match
-        if result.empty:
-            result: pd.DataFrame = self.fetch_ticker(
-                match_conditions="pb.symbol LIKE :pattern",
-                params={"pattern": f"{self.search_query[0]}%"},
-            )
-
-        return result.to_dict("records")
+        await asyncio.sleep(0.2)
+        async with self:
+            self.display_suggestion = state
+        if state:
+            yield SearchBarState.update_suggestions
 
-    def fetch_ticker(
-        self, match_conditions: str = "all", params: Any = None
-    ) -> pd.DataFrame:
-        """Fetch tickers from database with optional filters."""
-        if not db_settings.conn:
-            return pd.DataFrame(columns=["symbol", "pct_price_change", "industry"])
-
-        query: str = """
-                    SELECT
-                        pb.symbol,
-                        pb.pct_price_change,
-                        pb.accumulated_volume,
-                        od.industry
-                    FROM tickers.price_df AS pb
-                    JOIN tickers.overview_df AS od
-                        ON pb.symbol = od.symbol
-                    """
-        if match_conditions != "all":
-            query += f"WHERE {match_conditions}\n"
+    @rx.event(background=True)
+    async def update_suggestions(self):
+        """Look up the suggestions of the current query once typing pauses.
 
-        query += "ORDER BY pb.accumulated_volume DESC"
+        The lookup is cancelled if a newer one is requested meanwhile.
+        """
+        async with self:
+            query = self.search_query
+            client = self.router.session.client_token
 
         try:
-            with db_settings.conn.connect() as connection:
-                result: pd.DataFrame = pd.read_sql(
-                    text(query), connection, params=params
-                )
-                return result
+            suggestions = await debounced_suggest(client, query)
         except Exception as e:
-            print(f"Database error in fetch_ticker: {e}")
-            return pd.DataFrame(columns=["symbol", "pct_price_change", "industry"])
+            print(f"Database error in update_suggestions: {e}")
+            suggestions = []
 
-    @rx.event(background=True)
-    async def load_state(self):
-        """Preload tickers and track top trending tickers."""
-        while True:
+        if suggestions is not None:
             async with self:
-                self.ticker_list = self.fetch_ticker(match_conditions="all").to_dict(
-                    "records"
-                )
-                self.outstanding_tickers: Dict[str, Any] = {
-                    item["symbol"]: 1 for item in self.ticker_list[:3]
-                }
-            await asyncio.sleep(db_settings.interval)
+                self.suggestions = suggestions
+
+    @rx.var(cache=False)
+    async def outstanding_tickers(self) -> Dict[str, int]:
+        """Top trending tickers, from the shared ticker catalog."""
+        try:
+            return (await get_snapshot()).trending
+        except Exception as e:
+            print(f"Database error in outstanding_tickers: {e}")
+            return {}
@@ -1,11 +1,13 @@
 """Ticker board state for filtering and displaying ticker lists."""
 
+import asyncio
+
 import reflex as rx
-import pandas as pd
 from typing import List, Dict, Any, Set
-from sqlalchemy import TextClause, text
+from ..utils.board_cache import board_cache, board_signature, session_pages
+from ..utils.board_query import fetch_board_page
 from ..utils.scheduler import db_settings
-from ..utils.generate_query import get_suggest_ticker
+from ..utils.screener_engine import BoardPage, get_snapshot
 
 
 class TickerBoardState(rx.State):
@@ -23,6 +25,12 @@ class TickerBoardState(rx.State):
     selected_sort_order: str = "ASC"
     selected_sort_option: str = "symbol"
 
+    # Number of rows sent to the client, grown by infinite scroll
+    visible_rows: int = db_settings.board_page_size
+
+    def _reset_window(self):
+        self.visible_rows = db_settings.board_page_size
+
     @rx.event
     def apply_filters(self, filters: Dict[str, Any]):
         """Apply multiple filters at once."""
@@ -34,6 +42,7 @@ class TickerBoardState(rx.State):
             self.selected_fundamental_metric = filters["fundamental"]
         if "technical" in filters.keys():
             self.selected_technical_metric = filters["technical"]
+        self._reset_window()
 
     @rx.event
     def clear_all_filters(self):
@@ -42,95 +51,113 @@ class TickerBoardState(rx.State):
         self.selected_industry = set()
         self.selected_technical_metric = {}
         self.selected_fundamental_metric = {}
+        self._reset_window()
 
     @rx.event
     def set_search_query(self, value: str):
         """Update search query."""
         self.search_query = value
+        self._reset_window()
 
     @rx.event
     def set_sort_option(self, option: str):
         """Set column to sort by."""
         self.selected_sort_option = option
+        self._reset_window()
 
     @rx.event
     def set_sort_order(self, order: str):
         """Set sort order (ASC/DESC)."""
         self.selected_sort_order = order
+        self._reset_window()
+
+    @rx.event
+    async def load_more_tickers(self):
+        """Send the next page of rows to the client, up to the last match.
+
+        Once every match is visible the window stops growing, so scrolls past
+        the last row do not change the board's cache key.
+        """
+        total = (await self._board_page()).total
+        if self.visible_rows >= total:
+            return
+        self.visible_rows = min(self.visible_rows + db_settings.board_page_size, total)
+
+    @rx.event
+    async def on_board_scroll(self, near_end: bool):
+        """Load the next page once the user scrolls near the end of the list."""
+        if near_end:
+            await self.load_more_tickers()
+
+    async def _board_page(self) -> BoardPage:
+        """Return the visible rows matching current filters and search, with
+        the facets of all matches.
+
+        Only the visible rows are computed and sent to the client. The page is
+        looked up once per change and shared by the computed vars.
+        """
+        query = {
+            "search_query": self.search_query.upper(),
+            "industries": self.selected_industry,
+            "exchanges": self.selected_exchange,
+            "ranges": {
+                **self.selected_fundamental_metric,
+                **self.selected_technical_metric,
+            },
+            "sort_by": self.selected_sort_option,
+            "descending": self.selected_sort_order == "DESC",
+        }
+        key = board_signature(**query, limit=self.visible_rows)
+        token = self.router.session.client_token
+        last = session_pages.get(token)
+        if last is not None and last[0] == key:
+            return await last[1]
+
+        task = asyncio.ensure_future(self._load_board_page(key, query, token))
+        session_pages.put(token, (key, task))
+        return await task
+
+    async def _load_board_page(
+        self, key: str, query: Dict[str, Any], token: str
+    ) -> BoardPage:
+        page = board_cache.get(key)
+        if page is not None:
+            return page
+        try:
+            if db_settings.board_backend == "sql":
+                page = await fetch_board_page(self.visible_rows, **query)
+            else:
+                snapshot = await get_snapshot()
+                page = snapshot.page(self.visible_rows, **query)
+            board_cache.put(key, page)
+            return page
+        except Exception as e:
+            print(e)
+            # Not kept for the session, so the next change retries
+            session_pages.discard(lambda session: session == token)
+            return BoardPage([], 0)
+
+    @rx.var
+    async def get_all_tickers(self) -> List[Dict[str, Any]]:
+        """Get the visible tickers matching current filters and search."""
+        return (await self._board_page()).rows
+
+    @rx.var
+    async def total_tickers(self) -> int:
+        """Number of tickers matching current filters and search."""
+        return (await self._board_page()).total
+
+    @rx.var
+    async def industry_counts(self) -> Dict[str, int]:
+        """Matching tickers per industry, ignoring the industry filter."""
+        return (await self._board_page()).counts.get("industry", {})
+
+    @rx.var
+    async def exchange_counts(self) -> Dict[str, int]:
+        """Matching tickers per exchange, ignoring the exchange filter."""
+        return (await self._board_page()).counts.get("exchange", {})
 
     @rx.var
-    def get_all_tickers(self) -> List[Dict[str, Any]]:
-        """Get all tickers matching current filters and search."""
-        query: List[str] = [
-            f"""SELECT 
-                pb.symbol, pb.current_price, pb.accumulated_volume, pb.pct_price_change, pd.company_name, od.market_cap
-                FROM tickers.price_df AS pb 
-                JOIN tickers.profile_df AS pd ON pb.symbol = pd.symbol 
-                JOIN tickers.overview_df AS od ON pd.symbol = od.symbol
-                {"JOIN tickers.stats_df AS sd ON pd.symbol = sd.symbol" if len(self.selected_fundamental_metric) > 0 or len(self.selected_technical_metric) > 0 else ""}
-                WHERE
-            """
-        ]
-
-        if self.search_query != "":
-            match_query, params = get_suggest_ticker(
-                search_query=self.search_query.upper(), return_type="query"
-            )
-            query.append(match_query)
-        else:
-            query.append("1=1")
-            params = None
-
-        # Filter by industry
-        if len(self.selected_industry) > 0:
-            query.append(
-                f"AND industry IN ({', '.join(f"'{industry}'" for industry in self.selected_industry)})"
-            )
-
-        # Filter by exchange
-        if len(self.selected_exchange) > 0:
-            query.append(
-                f"AND exchange IN ({', '.join(f"'{exchange}'" for exchange in self.selected_exchange)})"
-            )
-
-        # Filter by fundamental metrics
-        if len(self.selected_fundamental_metric) > 0:
-            query.append(
-                " ".join(
-                    [
-                        f"AND {metric} BETWEEN {value_range[0]} AND {value_range[1]}"
-                        for metric, value_range in self.selected_fundamental_metric.items()
-                    ]
-                )
-            )
-
-        # Filter by technical metrics
-        if len(self.selected_technical_metric) > 0:
-            query.append(
-                " ".join(
-                    [
-                        f"AND {metric} BETWEEN {value_range[0]} AND {value_range[1]}"
-                        for metric, value_range in self.selected_technical_metric.items()
-                    ]
-                )
-            )
-
-        # Apply sorting
-        if self.selected_sort_option:
-            query.append(
-                f"ORDER BY {self.selected_sort_option} {self.selected_sort_order}"
-            )
-
-        full_query: TextClause = text(" ".join(query))
-
-        if not db_settings.conn:
-            return []
-
-        with db_settings.conn.connect() as connection:
-            try:
-                return pd.read_sql(full_query, connection, params=params).to_dict(
-                    "records"
-                )
-            except Exception as e:
-                print(e)
-                return []
+    async def metric_histograms(self) -> Dict[str, Dict[str, List[float]]]:
+        """Bucket edges and counts of each metric, ignoring its own range."""
+        return (await self._board_page()).histograms
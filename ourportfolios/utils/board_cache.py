@@ -0,0 +1,66 @@
+"""Process-wide cache of ticker board results.
+
+Users flip between a handful of filter combinations, so every worker keeps the
+board pages of the most recently used ones, keyed by `board_signature`, and
+shared by all its sessions. The least recently used entry is evicted past
+`board_cache_size` entries, and entries expire after `board_cache_ttl` seconds
+so rebuilds of the screener committed by other processes are picked up. The
+cache is cleared after every screener rebuild committed in this process.
+
+The board's computed vars all read the same page, so the last page requested
+by each session is also kept, and the vars of one change share a single
+lookup of the board cache instead of counting one hit per var.
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, List
+
+from .scheduler import db_settings
+from .screener import on_screener_refresh
+from .ttl_cache import TTLCache
+
+
+def board_signature(
+    search_query: str = "",
+    industries: Iterable[str] = (),
+    exchanges: Iterable[str] = (),
+    ranges: Dict[str, List[float]] | None = None,
+    sort_by: str = "symbol",
+    descending: bool = False,
+    limit: int | None = None,
+) -> str:
+    """Hash a board request, independent of the order of its filters."""
+    canonical = {
+        "search": search_query.strip().upper(),
+        "industries": sorted(industries),
+        "exchanges": sorted(exchanges),
+        "ranges": {
+            column: [float(low), float(high)]
+            for column, (low, high) in (ranges or {}).items()
+        },
+        "sort": [sort_by, bool(descending)],
+        "limit": limit,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+# Board pages by signature
+board_cache = TTLCache(db_settings.board_cache_size, db_settings.board_cache_ttl)
+
+# Signature and page task of the last board request of each session, by client
+# token
+session_pages = TTLCache(db_settings.board_cache_size, db_settings.board_cache_ttl)
+
+
+def get_board_cache_metrics() -> Dict[str, float]:
+    """Return the hit rate and counters of the board cache."""
+    return board_cache.snapshot()
+
+
+@on_screener_refresh
+def invalidate_board_cache() -> None:
+    """Drop every cached board result after a screener rebuild."""
+    board_cache.clear()
+    session_pages.clear()
@@ -0,0 +1,168 @@
+"""Parameterized SQL for the ticker board.
+
+Used when the board is served from PostgreSQL (`BOARD_BACKEND=sql`) rather
+than the in-memory screener engine. Every filter value is a bound parameter,
+and list filters are single array parameters, so the statement text only
+depends on which filters are active and on the sort. Sort columns come from
+a whitelist. The driver can then reuse its prepared statements and
+PostgreSQL its cached plans across users and filter values.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import TextClause, text
+
+from .database import fetch_records
+from .schema import SCREENER_METRICS
+from .screener import SCREENER_TABLE
+from .screener_engine import BOARD_COLUMNS, FACET_COLUMNS, BoardPage, get_snapshot
+
+# Columns the board may filter on by range, or sort by
+RANGE_COLUMNS: Tuple[str, ...] = SCREENER_METRICS + (
+    "current_price",
+    "price_change",
+    "pct_price_change",
+    "accumulated_volume",
+)
+SORT_COLUMNS: Tuple[str, ...] = RANGE_COLUMNS + (
+    "symbol",
+    "company_name",
+    "industry",
+    "exchange",
+)
+
+
+def board_conditions(
+    symbols: Iterable[str] | None = None,
+    industries: Iterable[str] = (),
+    exchanges: Iterable[str] = (),
+    ranges: Dict[str, List[float]] | None = None,
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Return the condition of each active filter, by filtered column, and
+    their parameters.
+
+    Raises:
+        ValueError: if a range column is not whitelisted
+    """
+    conditions: Dict[str, str] = {}
+    params: Dict[str, Any] = {}
+
+    if symbols is not None:
+        conditions["symbol"] = "symbol = ANY(:symbols)"
+        params["symbols"] = list(symbols)
+    if industries:
+        conditions["industry"] = "industry = ANY(:industries)"
+        params["industries"] = list(industries)
+    if exchanges:
+        conditions["exchange"] = "exchange = ANY(:exchanges)"
+        params["exchanges"] = list(exchanges)
+
+    # Sorted so the same set of ranges always gives the same statement
+    for column in sorted(ranges or {}):
+        if column not in RANGE_COLUMNS:
+            raise ValueError(f"Cannot filter the board on {column!r}")
+        low, high = ranges[column]
+        conditions[column] = f"{column} BETWEEN :{column}_low AND :{column}_high"
+        params[f"{column}_low"] = float(low)
+        params[f"{column}_high"] = float(high)
+    return conditions, params
+
+
+def where_clause(conditions: Dict[str, str], skip: str = "") -> str:
+    """AND the conditions together, leaving out the one of column `skip`."""
+    kept = [condition for column, condition in conditions.items() if column != skip]
+    return " WHERE " + " AND ".join(kept) if kept else ""
+
+
+def build_board_query(
+    symbols: Iterable[str] | None = None,
+    industries: Iterable[str] = (),
+    exchanges: Iterable[str] = (),
+    ranges: Dict[str, List[float]] | None = None,
+    sort_by: str = "symbol",
+    descending: bool = False,
+    limit: int | None = None,
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """Build the board query and its parameters.
+
+    With a `limit`, only the first rows are returned, each with the total
+    number of matches in a `total_rows` column.
+
+    Raises:
+        ValueError: if a range or sort column is not whitelisted
+    """
+    conditions, params = board_conditions(symbols, industries, exchanges, ranges)
+    if sort_by not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort the board by {sort_by!r}")
+    direction = "DESC" if descending else "ASC"
+
+    columns = list(BOARD_COLUMNS)
+    if limit is not None:
+        columns.append("COUNT(*) OVER () AS total_rows")
+    query = f"SELECT {', '.join(columns)} FROM tickers.{SCREENER_TABLE}"
+    query += where_clause(conditions)
+    query += f" ORDER BY {sort_by} {direction} NULLS LAST, symbol"
+    if limit is not None:
+        query += " LIMIT :limit"
+        params["limit"] = int(limit)
+    return text(query), params
+
+
+def build_facet_query(
+    symbols: Iterable[str] | None = None,
+    industries: Iterable[str] = (),
+    exchanges: Iterable[str] = (),
+    ranges: Dict[str, List[float]] | None = None,
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """Build one query counting tickers per value of every facet column,
+    each under every filter but its own.
+
+    Raises:
+        ValueError: if a range column is not whitelisted
+    """
+    conditions, params = board_conditions(symbols, industries, exchanges, ranges)
+    query = " UNION ALL ".join(
+        f"SELECT '{column}' AS facet, {column} AS value, COUNT(*) AS tickers "
+        f"FROM tickers.{SCREENER_TABLE}{where_clause(conditions, skip=column)} "
+        f"GROUP BY {column}"
+        for column in FACET_COLUMNS
+    )
+    return text(query), params
+
+
+async def fetch_board_page(
+    limit: int,
+    search_query: str = "",
+    industries: Iterable[str] = (),
+    exchanges: Iterable[str] = (),
+    ranges: Dict[str, List[float]] | None = None,
+    sort_by: str = "symbol",
+    descending: bool = False,
+) -> BoardPage:
+    """Return the first `limit` board rows with the facet counts of the result.
+
+    A search is first resolved to symbols by the ticker index of the
+    screener snapshot. Metric histograms are only computed by the in-memory
+    engine.
+    """
+    symbols: List[str] | None = None
+    if search_query:
+        snapshot = await get_snapshot()
+        matches = snapshot.ticker_index.search(search_query)
+        symbols = snapshot.columns["symbol"][matches].tolist()
+
+    filters = (symbols, industries, exchanges, ranges)
+    rows, facets = await asyncio.gather(
+        fetch_records(*build_board_query(*filters, sort_by, descending, limit)),
+        fetch_records(*build_facet_query(*filters)),
+    )
+
+    total = rows[0]["total_rows"] if rows else 0
+    for row in rows:
+        del row["total_rows"]
+    counts: Dict[str, Dict[str, int]] = {column: {} for column in FACET_COLUMNS}
+    for facet in facets:
+        if facet["value"]:
+            counts[facet["facet"]][facet["value"]] = facet["tickers"]
+    return BoardPage(rows, total, counts)
@@ -0,0 +1,151 @@
+"""Run and per-ticker progress bookkeeping for the database refresh.
+
+Each refresh job stages its batches in shadow tables of the `staging` schema
+and records every ticker it has written. A run that did not finish is resumed
+by the next run of the same job instead of refetching everything, as long as
+it is not older than the configured checkpoint age.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple
+
+from sqlalchemy import Connection, text
+
+from .scheduler import db_settings
+
+STAGING_SCHEMA = "staging"
+
+
+def ensure_checkpoint_tables(connection: Connection) -> None:
+    """Create the staging schema and the run/progress tables if missing."""
+    connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {STAGING_SCHEMA}"))
+    connection.execute(
+        text(f"""
+            CREATE TABLE IF NOT EXISTS {STAGING_SCHEMA}.refresh_runs (
+                run_id SERIAL PRIMARY KEY,
+                started_at TIMESTAMP NOT NULL DEFAULT now(),
+                finished_at TIMESTAMP
+            )
+        """)
+    )
+    connection.execute(
+        text(f"""
+            ALTER TABLE {STAGING_SCHEMA}.refresh_runs
+            ADD COLUMN IF NOT EXISTS job TEXT NOT NULL DEFAULT 'populate_db'
+        """)
+    )
+    connection.execute(
+        text(f"""
+            CREATE TABLE IF NOT EXISTS {STAGING_SCHEMA}.refresh_progress (
+                run_id INTEGER NOT NULL
+                    REFERENCES {STAGING_SCHEMA}.refresh_runs (run_id)
+                    ON DELETE CASCADE,
+                symbol TEXT NOT NULL,
+                completed_at TIMESTAMP NOT NULL DEFAULT now(),
+                PRIMARY KEY (run_id, symbol)
+            )
+        """)
+    )
+
+
+def get_unfinished_run(connection: Connection, job: str | None = None) -> Optional[int]:
+    """Return the id of the latest resumable run of a job, or of any job."""
+    max_age = timedelta(seconds=db_settings.checkpoint_max_age)
+    run_id = connection.execute(
+        text(f"""
+            SELECT run_id
+            FROM {STAGING_SCHEMA}.refresh_runs
+            WHERE finished_at IS NULL
+                AND started_at >= :oldest
+                AND (CAST(:job AS TEXT) IS NULL OR job = :job)
+            ORDER BY started_at DESC
+            LIMIT 1
+        """),
+        {"oldest": datetime.now() - max_age, "job": job},
+    ).scalar()
+    return run_id
+
+
+def reset_staging_table(connection: Connection, table: str) -> None:
+    """Recreate a staged table empty, with the columns of its live table.
+
+    Types carry over from one run to the next this way. Indexes are left out
+    and only built once the table is fully loaded.
+    """
+    connection.execute(text(f"DROP TABLE IF EXISTS {STAGING_SCHEMA}.{table}"))
+    if connection.execute(
+        text("SELECT to_regclass(:name)"), {"name": f"tickers.{table}"}
+    ).scalar():
+        connection.execute(
+            text(
+                f"CREATE TABLE {STAGING_SCHEMA}.{table} "
+                f"(LIKE tickers.{table} INCLUDING DEFAULTS)"
+            )
+        )
+
+
+def start_run(connection: Connection, job: str, tables: list[str]) -> int:
+    """Abandon a job's unfinished runs, reset its staged tables and open a new run."""
+    for table in tables:
+        reset_staging_table(connection, table)
+    connection.execute(
+        text(f"DELETE FROM {STAGING_SCHEMA}.refresh_runs WHERE job = :job"),
+        {"job": job},
+    )
+    return connection.execute(
+        text(
+            f"INSERT INTO {STAGING_SCHEMA}.refresh_runs (job) "
+            "VALUES (:job) RETURNING run_id"
+        ),
+        {"job": job},
+    ).scalar_one()
+
+
+def resume_or_start_run(
+    connection: Connection, job: str, tables: list[str]
+) -> Tuple[int, Set[str], bool]:
+    """Resume the latest unfinished run of a job or start a new one.
+
+    Returns:
+        Tuple[int, Set[str], bool]: run id, tickers already staged by the run
+            and whether the run is being resumed
+    """
+    ensure_checkpoint_tables(connection)
+
+    run_id = get_unfinished_run(connection, job)
+    if run_id is None:
+        return start_run(connection, job, tables), set(), False
+
+    done = connection.execute(
+        text(
+            f"SELECT symbol FROM {STAGING_SCHEMA}.refresh_progress "
+            "WHERE run_id = :run_id"
+        ),
+        {"run_id": run_id},
+    ).scalars()
+    return run_id, set(done), True
+
+
+def mark_done(connection: Connection, run_id: int, symbols: list[str]) -> None:
+    """Record tickers whose batch has been written to the staging area."""
+    if not symbols:
+        return
+    connection.execute(
+        text(f"""
+            INSERT INTO {STAGING_SCHEMA}.refresh_progress (run_id, symbol)
+            VALUES (:run_id, :symbol)
+            ON CONFLICT DO NOTHING
+        """),
+        [{"run_id": run_id, "symbol": symbol} for symbol in symbols],
+    )
+
+
+def finish_run(connection: Connection, run_id: int) -> None:
+    """Mark a run as complete so it is never resumed."""
+    connection.execute(
+        text(
+            f"UPDATE {STAGING_SCHEMA}.refresh_runs SET finished_at = now() "
+            "WHERE run_id = :run_id"
+        ),
+        {"run_id": run_id},
+    )
@@ -0,0 +1,110 @@
+"""Content hashes of fetched company datasets, used by the differential refresh.
+
+A hash is stored per (symbol, dataset) in `tickers.content_hashes`. A ticker's
+dataset is only written when its hash differs from the stored one. The stored
+`checked_at` tells how long ago an endpoint was last fetched and `changed_at`
+when its content last changed.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Connection, text
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Hash a frame's columns and rows, independent of row order."""
+    digest = hashlib.sha256("|".join(map(str, df.columns)).encode())
+    if not df.empty:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest.update(np.sort(row_hashes).tobytes())
+    return digest.hexdigest()
+
+
+# Hash stored for the datasets that came back empty for a symbol
+EMPTY_HASH = content_hash(pd.DataFrame())
+
+
+def hash_by_symbol(df: pd.DataFrame, symbol_column: str = "symbol") -> Dict[str, str]:
+    """Hash the rows of each symbol of a frame separately."""
+    return {
+        symbol: content_hash(rows)
+        for symbol, rows in df.groupby(symbol_column, sort=False)
+    }
+
+
+def ensure_hash_table(connection: Connection) -> None:
+    """Create the content hash table if it does not exist."""
+    connection.execute(
+        text("""
+            CREATE TABLE IF NOT EXISTS tickers.content_hashes (
+                symbol TEXT NOT NULL,
+                dataset TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                checked_at TIMESTAMP NOT NULL DEFAULT now(),
+                PRIMARY KEY (symbol, dataset)
+            )
+        """)
+    )
+    connection.execute(
+        text("""
+            ALTER TABLE tickers.content_hashes
+            ADD COLUMN IF NOT EXISTS changed_at TIMESTAMP NOT NULL DEFAULT now()
+        """)
+    )
+
+
+def get_hashes(
+    connection: Connection,
+) -> Dict[Tuple[str, str], Tuple[str, datetime, datetime]]:
+    """Return the stored `(hash, checked_at, changed_at)` of every (symbol, dataset)."""
+    rows = connection.execute(
+        text(
+            "SELECT symbol, dataset, hash, checked_at, changed_at "
+            "FROM tickers.content_hashes"
+        )
+    )
+    return {
+        (symbol, dataset): (hash_, checked_at, changed_at)
+        for symbol, dataset, hash_, checked_at, changed_at in rows
+    }
+
+
+def save_hashes(connection: Connection, dataset: str, hashes: Dict[str, str]) -> None:
+    """Upsert the hashes of one dataset and mark them as checked now."""
+    if not hashes:
+        return
+    connection.execute(
+        text("""
+            INSERT INTO tickers.content_hashes AS stored
+                (symbol, dataset, hash, checked_at, changed_at)
+            VALUES (:symbol, :dataset, :hash, now(), now())
+            ON CONFLICT (symbol, dataset) DO UPDATE SET
+                hash = EXCLUDED.hash,
+                checked_at = EXCLUDED.checked_at,
+                changed_at = CASE
+                    WHEN stored.hash = EXCLUDED.hash THEN stored.changed_at
+                    ELSE EXCLUDED.changed_at
+                END
+        """),
+        [
+            {"symbol": symbol, "dataset": dataset, "hash": hash_}
+            for symbol, hash_ in hashes.items()
+        ],
+    )
+
+
+def delete_hashes(connection: Connection, dataset: str, keep: list[str]) -> None:
+    """Delete the hashes of one dataset for the symbols not in `keep`."""
+    if not keep:
+        return
+    connection.execute(
+        text("""
+            DELETE FROM tickers.content_hashes
+            WHERE dataset = :dataset AND NOT (symbol = ANY(:symbols))
+        """),
+        {"dataset": dataset, "symbols": list(keep)},
+    )
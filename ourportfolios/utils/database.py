@@ -0,0 +1,212 @@
+"""Shared database access.
+
+The whole app goes through the one pooled SQLAlchemy `engine` defined here,
+exposed as `db_settings.conn`. Connections are pre-pinged on checkout and
+recycled after `DB_POOL_RECYCLE` seconds. The pool holds `DB_POOL_SIZE`
+connections plus up to `DB_MAX_OVERFLOW` temporary ones, and waits at most
+`DB_POOL_TIMEOUT` seconds for a free connection. Checkout wait times and pool
+saturation are available from `get_pool_metrics`.
+
+Reflex event handlers use the asyncpg-backed `async_engine` instead, through
+`read_sql_async` and `fetch_records`, so a slow query only suspends the
+handler that issued it rather than the whole event loop.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+from dotenv import load_dotenv
+from psycopg2.extras import RealDictCursor
+from sqlalchemy import TextClause, create_engine, exc, make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+load_dotenv()
+
+DATABASE_URI = os.getenv("DATABASE_URI")
+
+POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 10))
+POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 30 * 60))
+
+
+class PoolMetrics:
+    """Checkout wait times and saturation of the connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "mean_wait": (
+                    self.total_wait / self.checkouts if self.checkouts else 0.0
+                ),
+                "max_wait": self.max_wait,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class MeteredPool:
+    """Pool mixin recording how long each checkout waited for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+
+class MeteredQueuePool(MeteredPool, QueuePool):
+    metrics = pool_metrics
+
+
+class MeteredAsyncQueuePool(MeteredPool, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+engine = create_engine(
+    url=DATABASE_URI,
+    poolclass=MeteredQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+
+
+def asyncpg_url(uri: str):
+    """Translate the database URI for the asyncpg driver.
+
+    asyncpg takes the libpq `sslmode` query parameter as its `ssl` argument.
+    """
+    url = make_url(uri)
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url, {"ssl": sslmode} if sslmode else {}
+
+
+_async_url, _async_connect_args = asyncpg_url(DATABASE_URI)
+async_engine = create_async_engine(
+    _async_url,
+    connect_args=_async_connect_args,
+    poolclass=MeteredAsyncQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+
+
+def get_pool_metrics(asynchronous: bool = False) -> Dict[str, float]:
+    """Return the current state and checkout statistics of a pool.
+
+    Args:
+        asynchronous (bool): report the async engine's pool instead
+    """
+    pool = async_engine.pool if asynchronous else engine.pool
+    metrics = async_pool_metrics if asynchronous else pool_metrics
+    capacity = POOL_SIZE + MAX_OVERFLOW
+    checked_out = pool.checkedout()
+    counters = metrics.snapshot()
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": checked_out / capacity if capacity else 0.0,
+        "peak_saturation": (
+            counters.pop("peak_checked_out") / capacity if capacity else 0.0
+        ),
+        **counters,
+    }
+
+
+@contextmanager
+def dbapi_connection() -> Iterator:
+    """Borrow a raw psycopg2 connection from the pool.
+
+    The transaction is committed when the block exits, or rolled back if it
+    raises, and the connection then goes back to the pool.
+    """
+    connection = engine.raw_connection()
+    try:
+        yield connection
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def execute_query(query: str, params: tuple | None = None) -> List[Dict]:
+    """Run a psycopg2-style query on a pooled connection, returning dict rows."""
+    try:
+        with dbapi_connection() as connection:
+            with connection.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                if cur.description:
+                    return [dict(row) for row in cur.fetchall()]
+                return []
+    except Exception as e:
+        print(f"Database query error: {e}")  # noqa: T201
+        return []
+
+
+async def read_sql_async(
+    query: str | TextClause, params: Dict[str, Any] | None = None
+) -> pd.DataFrame:
+    """Run a query on the async engine and return the result as a DataFrame."""
+    if isinstance(query, str):
+        query = text(query)
+    async with async_engine.connect() as connection:
+        result = await connection.execute(query, params or {})
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+async def fetch_records(
+    query: str | TextClause, params: Dict[str, Any] | None = None
+) -> List[Dict[str, Any]]:
+    """Run a query on the async engine and return its rows as dicts."""
+    if isinstance(query, str):
+        query = text(query)
+    async with async_engine.connect() as connection:
+        result = await connection.execute(query, params or {})
+        return [dict(row) for row in result.mappings()]
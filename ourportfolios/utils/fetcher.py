@@ -0,0 +1,150 @@
+"""Concurrent, rate-limited company data fetcher.
+
+Company datasets are fetched for many tickers in parallel on a bounded thread
+pool. Every provider call first takes a token from the token bucket of its
+source (TCBS/VCI) so the crawl stays under the provider's request budget,
+and goes through `resilient_call` for retries and circuit breaking.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, Tuple
+
+import pandas as pd
+
+from .providers import get_provider
+from .resilience import CircuitOpenError, resilient_call
+from .scheduler import db_settings
+
+COMPANY_ENDPOINTS: Tuple[str, ...] = (
+    "overview",
+    "shareholders",
+    "events",
+    "news",
+    "profile",
+    "officers",
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block until `tokens` tokens are available, then consume them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate,
+                )
+                self._last_refill = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str) -> TokenBucket:
+    """Return the shared token bucket for a data source."""
+    source = source.upper()
+    with _buckets_lock:
+        if source not in _buckets:
+            rate, capacity = db_settings.rate_limits.get(
+                source, db_settings.default_rate_limit
+            )
+            _buckets[source] = TokenBucket(rate=rate, capacity=capacity)
+        return _buckets[source]
+
+
+def fetch_company(
+    ticker: str,
+    source: str = "TCBS",
+    endpoints: Tuple[str, ...] = COMPANY_ENDPOINTS,
+) -> Dict[str, pd.DataFrame]:
+    """Fetch the requested company datasets of a single ticker."""
+    limiter = get_rate_limiter(source)
+    provider = get_provider()
+
+    def call(endpoint: str) -> pd.DataFrame:
+        limiter.acquire()
+        return provider.company(ticker, endpoint, source)
+
+    return {
+        endpoint: resilient_call(
+            source, f"company.{endpoint}", lambda endpoint=endpoint: call(endpoint)
+        )
+        for endpoint in endpoints
+    }
+
+
+def fetch_companies(
+    tickers: list[str],
+    source: str = "TCBS",
+    endpoints: Tuple[str, ...] = COMPANY_ENDPOINTS,
+    max_workers: int | None = None,
+) -> Iterator[Tuple[str, Dict[str, pd.DataFrame]]]:
+    """Fetch company datasets for many tickers concurrently.
+
+    Yields `(ticker, frames)` pairs as soon as each ticker completes. Tickers
+    that fail with a non-transient error, or still fail after their retries,
+    are reported and skipped; only transient errors feed the circuit breaker.
+    If the source's circuit opens, the pending tickers are cancelled and
+    `CircuitOpenError` is raised, so the refresh stops instead of writing
+    partial tables. Throughput is printed once every ticker has been processed.
+    """
+    max_workers = max_workers or db_settings.fetch_workers
+    started = time.perf_counter()
+    fetched = 0
+    failed: list[str] = []
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="company-fetch"
+    )
+    try:
+        futures = {
+            executor.submit(fetch_company, ticker, source, endpoints): ticker
+            for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                frames = future.result()
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                print(f"Error fetching data for {ticker}: {e}")  # noqa: T201
+                failed.append(ticker)
+                continue
+
+            fetched += 1
+            yield ticker, frames
+    finally:
+        # Queued tickers are dropped, rather than fetched for nothing, when
+        # the circuit opens or the consumer stops or fails early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    print(  # noqa: T201
+        f"Fetched {fetched}/{len(tickers)} tickers from {source} in {elapsed:.1f}s "
+        f"({fetched / elapsed if elapsed > 0 else 0:.2f} tickers/sec)"
+    )
+    if failed:
+        print(  # noqa: T201
+            f"Skipped {len(failed)} tickers: {', '.join(sorted(failed))}"
+        )
@@ -0,0 +1,78 @@
+"""Process-wide cache of the DataFrames behind the ticker analysis page.
+
+Company tables and price histories used to be stored as DataFrames in each
+session's Reflex state, so every session kept, pickled and diffed its own
+copy. They are now kept once per worker, keyed by ticker, and shared by
+reference by all its sessions. Cached frames must not be mutated.
+
+The least recently used entry is evicted past `frame_cache_size` entries, and
+entries expire after `frame_cache_ttl` seconds. The company tables of a ticker
+are also dropped once a refresh rewrites them; the intraday price board
+refresh does not touch them. Failed or empty fetches are cached too, for
+`frame_cache_failure_ttl` seconds, so a failing ticker is not refetched on
+every page load.
+"""
+
+from typing import Dict
+
+import pandas as pd
+
+from .load_data import (
+    fetch_companies_data_async,
+    load_historical_data,
+    on_tables_written,
+)
+from .scheduler import db_settings
+from .ttl_cache import TTLCache
+
+# Company tables shown on the ticker page. The price board, rewritten all
+# trading day, is left out.
+COMPANY_FRAMES = ("overview", "shareholders", "events", "news", "profile", "officers")
+
+# Company tables by ("company", ticker) and price histories by
+# ("history", ticker, interval, start, end)
+frame_cache = TTLCache(db_settings.frame_cache_size, db_settings.frame_cache_ttl)
+
+
+async def get_company_frames(ticker: str) -> Dict[str, pd.DataFrame]:
+    """Return the company tables of a ticker, by table name."""
+    key = ("company", ticker)
+    frames = frame_cache.get(key)
+    if frames is None:
+        frames = (await fetch_companies_data_async([ticker], COMPANY_FRAMES))[ticker]
+        empty = all(frame.empty for frame in frames.values())
+        frame_cache.put(
+            key, frames, ttl=db_settings.frame_cache_failure_ttl if empty else None
+        )
+    return frames
+
+
+def get_price_history(ticker: str, interval: str, start: str, end: str) -> pd.DataFrame:
+    """Return the price history of a ticker between two YYYY-MM-DD dates."""
+    key = ("history", ticker, interval, start, end)
+    df = frame_cache.get(key)
+    if df is None:
+        try:
+            df = load_historical_data(ticker, start=start, end=end, interval=interval)
+        except Exception as e:
+            print(f"Error loading {ticker} {interval} history: {e}")  # noqa: T201
+            df = pd.DataFrame()
+        frame_cache.put(
+            key, df, ttl=db_settings.frame_cache_failure_ttl if df.empty else None
+        )
+    return df
+
+
+def get_frame_cache_metrics() -> Dict[str, float]:
+    """Return the hit rate and counters of the frame cache."""
+    return frame_cache.snapshot()
+
+
+@on_tables_written
+def invalidate_company_frames(tables: list[str], symbols: list[str] | None) -> None:
+    """Drop the cached company tables of the tickers a refresh rewrote."""
+    if not any(table.removesuffix("_df") in COMPANY_FRAMES for table in tables):
+        return
+    frame_cache.discard(
+        lambda key: key[0] == "company" and (symbols is None or key[1] in symbols)
+    )
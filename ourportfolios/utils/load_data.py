@@ -1,257 +1,798 @@
 """Load and preprocess stock and company data.
 
 This module provides utilities to fetch company data via vnstock (overview,
-shareholders, events, news, profile, officers), preprocess those datasets,
-load price boards and historical quotes, and populate the database on a
-scheduled interval using the configured scheduler and database settings.
+shareholders, events, news, profile, officers) with a concurrent, rate-limited
+fetcher, preprocess those datasets on a process pool, load price boards and
+historical quotes, and keep the database populated by registering one refresh
+job per dataset, each on its own cadence, with the refresh job registry.
 """
 
+import io
+import json
 import time
 import warnings
+from concurrent.futures import as_completed
 from datetime import date, datetime, timedelta
+from typing import Callable, Iterator
 
-import numpy as np
 import pandas as pd
-from sqlalchemy import text
-from vnstock import Screener, Trading, Vnstock
-
-from .preprocess_texts import process_events_for_display
-from .scheduler import db_scheduler, db_settings
+from sqlalchemy import Connection, TextClause, text
+from sqlalchemy.exc import OperationalError
+
+from .checkpoint import (
+    STAGING_SCHEMA,
+    ensure_checkpoint_tables,
+    finish_run,
+    mark_done,
+    reset_staging_table,
+    resume_or_start_run,
+)
+from .content_hash import (
+    EMPTY_HASH,
+    delete_hashes,
+    ensure_hash_table,
+    get_hashes,
+    hash_by_symbol,
+    save_hashes,
+)
+from .database import async_engine
+from .fetcher import fetch_companies
+from .preprocessing.company_data import preprocess_company
+from .providers import get_provider
+from .refresh_jobs import refresh_job, run_refresh_jobs
+from .resilience import resilient_call
+from .schema import (
+    apply_table_schema,
+    get_column_types,
+    migrate_schema,
+    table_key,
+)
+from .screener import SCREENER_SOURCES, notify_screener_refresh, refresh_screener
+from .scheduler import (
+    db_scheduler,
+    db_settings,
+    get_preprocess_pool,
+    is_market_open,
+)
 
 warnings.filterwarnings("ignore")
 
 
+# Slow-moving endpoints. A differential refresh only fetches them for tickers
+# whose overview changed since, or that were last checked too long ago, so it
+# can afford to check them daily.
+HEAVY_ENDPOINTS = ("shareholders", "profile", "officers")
+HEAVY_CADENCE = (
+    timedelta(days=1)
+    if db_settings.refresh_mode == "differential"
+    else timedelta(weeks=1)
+)
+
+# Postgres column types whose values are written from "Int64" frames
+INTEGER_TYPES = ("bigint", "integer", "smallint")
+
+
+@refresh_job("stats", cadence=timedelta(days=1))
+def refresh_stats() -> None:
+    """Refresh the screener stats, which also define the ticker universe."""
+    write_table(fetch_stats_df(), "stats_df")
+
+
+@refresh_job("price", cadence=timedelta(days=1), depends_on=("stats",))
+def refresh_prices() -> None:
+    """Reload the whole price board so it follows the ticker universe."""
+    write_table(load_price_df(get_ticker_universe()["ticker"].to_list()), "price_df")
+
+
+@refresh_job("news", cadence=timedelta(hours=1), depends_on=("stats",))
+def refresh_news() -> None:
+    refresh_company_tables(("news",))
+
+
+@refresh_job("events", cadence=timedelta(days=1), depends_on=("stats",))
+def refresh_events() -> None:
+    refresh_company_tables(("events",))
+
+
+@refresh_job("overview", cadence=timedelta(days=1), depends_on=("stats",))
+def refresh_overview() -> None:
+    refresh_company_tables(("overview",))
+
+
+@refresh_job("shareholders", cadence=HEAVY_CADENCE, depends_on=("stats", "overview"))
+def refresh_shareholders() -> None:
+    refresh_company_tables(("shareholders",))
+
+
+@refresh_job("profile", cadence=HEAVY_CADENCE, depends_on=("stats", "overview"))
+def refresh_profile() -> None:
+    refresh_company_tables(("profile",))
+
+
+@refresh_job("officers", cadence=HEAVY_CADENCE, depends_on=("stats", "overview"))
+def refresh_officers() -> None:
+    refresh_company_tables(("officers",))
+
+
+def populate_db() -> None:
+    """Refresh every dataset now, regardless of its cadence."""
+    migrate_schema()
+    run_refresh_jobs(force=True)
+
+
+def catch_up_refresh_jobs() -> None:
+    """Run the refresh jobs that came due, or were interrupted, while the app
+    was down, and drop the single daily populate_db job they replace.
+
+    Pending schema migrations of the live tables are applied, and the
+    screener table built, first.
+    """
+    migrate_schema()
+    with db_settings.conn.begin() as connection:
+        refreshed = refresh_screener(connection)
+    if refreshed:
+        notify_screener_refresh()
+    if db_scheduler.get_job("populate_db"):
+        db_scheduler.remove_job("populate_db")
+    db_scheduler.modify_job("run_due_refreshes", next_run_time=datetime.now())
+
+
 @db_scheduler.scheduled_job(
     trigger="interval",
-    seconds=db_settings.interval,
-    id="populate_db",
-    start_date=datetime.now() + timedelta(seconds=db_settings.interval),
+    seconds=db_settings.price_interval,
+    id="refresh_price_board",
+    executor="prices",
+    jobstore="memory",
+    max_instances=1,
+    coalesce=True,
 )
-def populate_db() -> None:
+def refresh_price_board() -> None:
+    """Update tickers.price_df in place from a single price board call.
+
+    Runs every `price_interval` seconds while the market is open, independent
+    of the daily company data refresh.
+    """
+    if not is_market_open():
+        return
+
     with db_settings.conn.connect() as connection:
-        connection.execute(text("CREATE SCHEMA IF NOT EXISTS tickers"))
-        connection.commit()
+        if not get_column_types(connection, "price_df", "tickers"):
+            return
+        ticker_list = (
+            connection.execute(text("SELECT symbol FROM tickers.price_df"))
+            .scalars()
+            .all()
+        )
 
-    stats_df = fetch_stats_df()
-    ticker_list = stats_df["ticker"].to_list()
+    if not ticker_list:
+        return
 
-    overview_list = []
-    shareholders_list = []
-    events_list = []
-    news_list = []
-    profile_list = []
-    officers_list = []
+    price_df = load_price_df(ticker_list)
+    with db_settings.conn.begin() as connection:
+        upsert_df(price_df, "price_df", connection, symbols=ticker_list)
+        refreshed = refresh_screener(connection)
+    if refreshed:
+        notify_screener_refresh()
 
-    for ticker in ticker_list:
+
+def get_ticker_universe() -> pd.DataFrame:
+    """Return the tickers and market caps of the current screener universe."""
+    return pd.read_sql(
+        text("SELECT symbol AS ticker, market_cap FROM tickers.stats_df"),
+        db_settings.conn,
+    )
+
+
+# Callbacks run with the live tables, and the symbols (None for all) whose rows
+# a refresh rewrote, once its transaction commits
+_write_listeners: list[Callable[[list[str], list[str] | None], None]] = []
+
+
+def on_tables_written(
+    callback: Callable[[list[str], list[str] | None], None],
+) -> Callable[[list[str], list[str] | None], None]:
+    """Register a callback run after every committed refresh of live tables."""
+    _write_listeners.append(callback)
+    return callback
+
+
+def notify_tables_written(tables: list[str], symbols: list[str] | None = None) -> None:
+    """Run the table write callbacks.
+
+    Called once the transaction that wrote the tables has committed.
+    """
+    for callback in _write_listeners:
         try:
-            company = Vnstock().stock(symbol=ticker, source="TCBS").company
-
-            overview = company.overview()
-            shareholders = company.shareholders()
-            events = company.events()
-            news = company.news()
-            profile = company.profile()
-            officers_info = company.officers()
-
-            if overview is not None and not overview.empty:
-                market_cap_value = stats_df.loc[
-                    stats_df["ticker"] == ticker,
-                    "market_cap",
-                ].squeeze()
-                overview["market_cap"] = market_cap_value
-                overview_list.append(overview)
-
-            if shareholders is not None and not shareholders.empty:
-                shareholders["symbol"] = ticker
-                shareholders_list.append(shareholders)
-
-            if events is not None and not events.empty:
-                events["symbol"] = ticker
-                events_list.append(events)
-
-            if news is not None and not news.empty:
-                news["symbol"] = ticker
-                news_list.append(news)
-
-            if profile is not None and not profile.empty:
-                profile_list.append(profile)
-
-            if officers_info is not None and not officers_info.empty:
-                officers_info["symbol"] = ticker
-                officers_list.append(officers_info)
-
-            time.sleep(1)
+            callback(tables, symbols)
         except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")  # noqa: T201
-            continue
+            print(  # noqa: T201
+                f"Error in table write callback {callback.__name__}: {e}"
+            )
 
-    overview_df = preprocess_overview(overview_list)
-    shareholders_df = preprocess_shareholders(shareholders_list)
-    events_df = preprocess_events(events_list)
-    news_df = preprocess_news(news_list)
-    profile_df = preprocess_profile(profile_list)
-    officers_df = preprocess_officers(officers_list)
 
-    overview_df.to_sql(
-        "overview_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+def is_differential(tables: list[str]) -> bool:
+    """Whether tables are refreshed in place, which needs them to exist."""
+    if db_settings.refresh_mode != "differential":
+        return False
+    with db_settings.conn.connect() as connection:
+        return all(get_column_types(connection, table, "tickers") for table in tables)
 
-    shareholders_df.to_sql(
-        "shareholders_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
 
-    events_df.to_sql(
-        "events_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+def write_table(df: pd.DataFrame, table: str) -> None:
+    """Replace the content of a whole live table.
 
-    news_df.to_sql(
-        "news_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+    The frame is staged and swapped in, or upserted in place on a
+    differential refresh, which also deletes the rows of symbols missing
+    from the frame.
+    """
+    if is_differential([table]):
+        symbols = df["symbol"].drop_duplicates().to_list() if not df.empty else []
+        with db_settings.conn.begin() as connection:
+            upsert_df(df, table, connection, symbols=symbols)
+            prune_df(table, connection, keep=symbols)
+            refreshed = table in SCREENER_SOURCES and refresh_screener(connection)
+        notify_tables_written([table])
+        if refreshed:
+            notify_screener_refresh()
+        return
+
+    with db_settings.conn.begin() as connection:
+        ensure_checkpoint_tables(connection)
+        reset_staging_table(connection, table)
+        bulk_write_df(df, table, connection, schema=STAGING_SCHEMA)
+    swap_staging_tables([table])
+
+
+def refresh_company_tables(endpoints: tuple[str, ...]) -> None:
+    """Refresh company datasets for every ticker of the universe."""
+    tables = [f"{endpoint}_df" for endpoint in endpoints]
+    stats_df = get_ticker_universe()
+
+    if is_differential(tables):
+        refresh_differential(endpoints, stats_df)
+    else:
+        refresh_full(endpoints, stats_df)
 
-    profile_df.to_sql(
-        "profile_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
 
-    officers_df.to_sql(
-        "officers_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+def refresh_full(endpoints: tuple[str, ...], stats_df: pd.DataFrame) -> None:
+    """Rebuild company tables through checkpointed shadow tables.
 
-    stats_df.to_sql(
-        "stats_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+    Batches are staged as they complete and checkpointed per ticker, so an
+    interrupted run of the same job resumes where it stopped. The staged
+    tables are swapped in once every ticker has been fetched.
+    """
+    job = "+".join(endpoints)
+    tables = [f"{endpoint}_df" for endpoint in endpoints]
+
+    with db_settings.conn.begin() as connection:
+        run_id, done, resumed = resume_or_start_run(connection, job, tables)
+    if resumed:
+        print(  # noqa: T201
+            f"Resuming {job} refresh run {run_id} ({len(done)} tickers staged)"
+        )
 
-    price_df = load_price_df(ticker_list)
-    price_df.to_sql(
-        "price_df",
-        db_settings.conn,
-        schema="tickers",
-        if_exists="replace",
-        index=False,
-    )
+    pending = [ticker for ticker in stats_df["ticker"] if ticker not in done]
+    batch = {endpoint: [] for endpoint in endpoints}
+    batch_tickers = []
 
+    fetched = fetch_companies(pending, endpoints=endpoints)
+    for ticker, frames in preprocess_companies(fetched, stats_df):
+        for endpoint, df in frames.items():
+            batch[endpoint].append(df)
+        batch_tickers.append(ticker)
+        if len(batch_tickers) >= db_settings.checkpoint_batch_size:
+            write_staging_batch(run_id, batch, batch_tickers)
+            batch = {endpoint: [] for endpoint in endpoints}
+            batch_tickers = []
+
+    write_staging_batch(run_id, batch, batch_tickers)
+    swap_staging_tables(tables, run_id)
 
-def preprocess_overview(overview_list: list) -> pd.DataFrame:
-    df = pd.concat(overview_list, ignore_index=True)
-    df["website"] = (
-        df["website"].str.removeprefix("https://").str.removeprefix("http://")
-    )
-    df["foreign_percent"] = round(df["foreign_percent"] * 100, 2)
-    df = df.drop(
-        [
-            "industry_id",
-            "industry_id_v2",
-            "delta_in_year",
-            "delta_in_month",
-            "delta_in_week",
-            "stock_rating",
-            "company_type",
-        ],
-        axis=1,
-    )
 
-    return df
+def refresh_differential(endpoints: tuple[str, ...], stats_df: pd.DataFrame) -> None:
+    """Refresh company tables in place, writing only the data that changed.
 
+    Each dataset is hashed per ticker and only tickers whose hash differs
+    from the stored one are upserted. Slow-moving endpoints are only fetched
+    for tickers whose overview changed since their last check, or that were
+    last checked more than `differential_max_age` seconds ago.
+    """
+    with db_settings.conn.begin() as connection:
+        ensure_hash_table(connection)
+        stored = get_hashes(connection)
+
+    tickers = stats_df["ticker"].to_list()
+    heavy = [endpoint for endpoint in endpoints if endpoint in HEAVY_ENDPOINTS]
+    if heavy:
+        stale_before = datetime.now() - timedelta(
+            seconds=db_settings.differential_max_age
+        )
+        tickers = [
+            ticker
+            for ticker in tickers
+            if any(
+                (ticker, endpoint) not in stored
+                or stored[(ticker, endpoint)][1] < stale_before
+                or stored.get((ticker, "signal"), (None, None, stale_before))[2]
+                > stored[(ticker, endpoint)][1]
+                for endpoint in heavy
+            )
+        ]
+
+    batch = {endpoint: [] for endpoint in endpoints}
+    batch_tickers = []
+
+    fetched = fetch_companies(tickers, endpoints=endpoints)
+    for ticker, frames in preprocess_companies(fetched, stats_df):
+        for endpoint, df in frames.items():
+            batch[endpoint].append(df)
+        batch_tickers.append(ticker)
+        if len(batch_tickers) >= db_settings.checkpoint_batch_size:
+            write_changed_batch(batch, stored, batch_tickers)
+            batch = {endpoint: [] for endpoint in endpoints}
+            batch_tickers = []
+
+    write_changed_batch(batch, stored, batch_tickers)
+
+    # Tickers that left the universe are dropped, with their hashes so they
+    # are written again if they come back
+    universe = stats_df["ticker"].to_list()
+    pruned = []
+    refreshed = False
+    with db_settings.conn.begin() as connection:
+        for endpoint in endpoints:
+            if prune_df(f"{endpoint}_df", connection, keep=universe):
+                pruned.append(f"{endpoint}_df")
+            delete_hashes(connection, endpoint, keep=universe)
+            if endpoint == "overview":
+                delete_hashes(connection, "signal", keep=universe)
+        if any(f"{endpoint}_df" in SCREENER_SOURCES for endpoint in endpoints):
+            refreshed = refresh_screener(connection)
+    if pruned:
+        notify_tables_written(pruned)
+    if refreshed:
+        notify_screener_refresh()
+
+
+def check_staged_rows(connection: Connection, tables: list[str]) -> None:
+    """Refuse staged tables that would empty or shrink their live table."""
+    for table in tables:
+        staged = connection.execute(
+            text(f"SELECT count(*) FROM {STAGING_SCHEMA}.{table}")
+        ).scalar_one()
+        live = (
+            connection.execute(
+                text(f"SELECT count(*) FROM tickers.{table}")
+            ).scalar_one()
+            if get_column_types(connection, table, "tickers")
+            else 0
+        )
+        if staged == 0 or staged < db_settings.swap_min_row_share * live:
+            raise RuntimeError(
+                f"Refusing to swap {table}: {staged} staged rows for {live} live rows"
+            )
+
+
+def swap_staging_tables(tables: list[str], run_id: int | None = None) -> None:
+    """Index the staged tables and swap them into the tickers schema.
+
+    Indexes and planner statistics are built on the shadow tables first, then
+    every live table is replaced in one transaction, so readers see either the
+    previous or the new version of the tables and never a missing or
+    half-written table. The swap only waits `swap_lock_timeout` for readers to
+    release their locks and is retried, rather than queueing the hot read path
+    behind an exclusive lock request. The screener table is rebuilt and the
+    refresh run, if any, is closed in the same transaction.
+
+    Raises:
+        RuntimeError: if a staged table is empty, or holds less than
+            `swap_min_row_share` of the rows of its live table, as when every
+            ticker failed. The live tables are kept and the run stays open.
+    """
+    with db_settings.conn.begin() as connection:
+        connection.execute(text("CREATE SCHEMA IF NOT EXISTS tickers"))
+        staged = [
+            table
+            for table in tables
+            if get_column_types(connection, table, STAGING_SCHEMA)
+        ]
+        check_staged_rows(connection, staged)
+        for table in staged:
+            apply_table_schema(connection, table, STAGING_SCHEMA)
+            connection.execute(text(f"ANALYZE {STAGING_SCHEMA}.{table}"))
 
-def preprocess_shareholders(shareholders_list: list) -> pd.DataFrame:
-    df = pd.concat(shareholders_list, ignore_index=True)
-    df["share_own_percent"] = (df["share_own_percent"] * 100).round(2)
-    return df
+    for attempt in range(1, db_settings.swap_retries + 1):
+        try:
+            with db_settings.conn.begin() as connection:
+                connection.execute(
+                    text(f"SET LOCAL lock_timeout = '{db_settings.swap_lock_timeout}'")
+                )
+                for table in staged:
+                    connection.execute(text(f"DROP TABLE IF EXISTS tickers.{table}"))
+                    connection.execute(
+                        text(f"ALTER TABLE {STAGING_SCHEMA}.{table} SET SCHEMA tickers")
+                    )
+                refreshed = False
+                if any(table in SCREENER_SOURCES for table in staged):
+                    refreshed = refresh_screener(connection)
+                if run_id is not None:
+                    finish_run(connection, run_id)
+            break
+        except OperationalError as e:
+            print(f"Table swap attempt {attempt} failed: {e}")  # noqa: T201
+            time.sleep(attempt)
+    else:
+        raise RuntimeError(f"Could not swap staged tables {', '.join(staged)}")
 
+    notify_tables_written(staged)
+    if refreshed:
+        notify_screener_refresh()
 
-def preprocess_profile(profile_list: list) -> pd.DataFrame:
-    df = pd.concat(profile_list, ignore_index=True)
-    return df
 
+def tag_company_frames(
+    ticker: str,
+    frames: dict[str, pd.DataFrame],
+    stats_df: pd.DataFrame,
+) -> None:
+    """Tag a ticker's fetched frames with its symbol and market cap."""
+    for endpoint, df in frames.items():
+        if df is None or df.empty:
+            continue
 
-def preprocess_events(events_list: list) -> pd.DataFrame:
-    df = pd.concat(events_list, ignore_index=True)
-    df["price_change_ratio"] = df["price_change_ratio"].fillna(np.nan)
-    df["price_change_ratio"] = (df["price_change_ratio"] * 100).round(2)
+        if endpoint == "overview":
+            df["market_cap"] = stats_df.loc[
+                stats_df["ticker"] == ticker,
+                "market_cap",
+            ].squeeze()
+        elif endpoint != "profile":
+            df["symbol"] = ticker
 
-    df = pd.DataFrame(process_events_for_display(df.to_dict("records")))
-    df = df[["symbol", "event_name", "price_change_ratio", "event_desc"]]
-    return df
 
+def preprocess_companies(
+    fetched: Iterator[tuple[str, dict[str, pd.DataFrame]]],
+    stats_df: pd.DataFrame,
+) -> Iterator[tuple[str, dict[str, pd.DataFrame]]]:
+    """Preprocess fetched tickers on the process pool as they arrive.
 
-def preprocess_news(news_list: list) -> pd.DataFrame:
-    df = pd.concat(news_list, ignore_index=True)
+    Each ticker is submitted as soon as it is fetched and yielded once
+    preprocessed, so fetching and preprocessing overlap. Tickers whose
+    preprocessing fails are reported and skipped, like failed fetches.
+    """
+    pool = get_preprocess_pool()
+    pending = {}
 
-    df["price_change_ratio"] = pd.to_numeric(df["price_change_ratio"], errors="coerce")
-    df = df[~df["title"].str.contains("insider", case=False, na=False)]
-    df["price_change_ratio"] = (df["price_change_ratio"] * 100).round(2)
-    df = df[["symbol", "title", "publish_date", "price_change_ratio"]]
-    return df
+    def results(futures):
+        for future in futures:
+            ticker = pending.pop(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                print(f"Error preprocessing data for {ticker}: {e}")  # noqa: T201
+
+    for ticker, frames in fetched:
+        tag_company_frames(ticker, frames, stats_df)
+        pending[pool.submit(preprocess_company, ticker, frames)] = ticker
+        yield from results([future for future in pending if future.done()])
+
+    yield from results(as_completed(list(pending)))
+
+
+def write_staging_batch(run_id: int, batch: dict[str, list], tickers: list[str]):
+    """Preprocess a batch of fetched tickers, append it to the staging tables
+    and checkpoint those tickers in the same transaction."""
+    with db_settings.conn.begin() as connection:
+        for table, frames in batch.items():
+            if not frames:
+                continue
+            df = pd.concat(frames, ignore_index=True)
+            key = table_key(f"{table}_df")
+            if key:
+                df = df.drop_duplicates(subset=key, keep="last")
+            bulk_write_df(
+                df,
+                f"{table}_df",
+                connection,
+                schema=STAGING_SCHEMA,
+                if_exists="append",
+            )
+        mark_done(connection, run_id, tickers)
+
+
+def write_changed_batch(
+    batch: dict[str, list],
+    stored: dict[tuple[str, str], tuple[str, datetime, datetime]],
+    tickers: list[str],
+) -> None:
+    """Upsert the tickers of a batch whose content hash changed.
+
+    Tickers of the batch with no rows for a dataset, as when its endpoint came
+    back empty, get the hash of an empty frame and their previous rows are
+    deleted, so they are not refetched as never checked. The overview is also
+    hashed without its market cap, as the "signal" that tells whether the
+    slow-moving endpoints of a ticker need a refetch.
+    """
+    written = []
+    with db_settings.conn.begin() as connection:
+        for table, frames in batch.items():
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            hashes = hash_by_symbol(df) if not df.empty else {}
+            changed = [
+                symbol
+                for symbol, hash_ in hashes.items()
+                if stored.get((symbol, table), (None,))[0] != hash_
+            ]
+            if changed:
+                upsert_df(
+                    df[df["symbol"].isin(changed)],
+                    f"{table}_df",
+                    connection,
+                    symbols=changed,
+                )
+                written.append(([f"{table}_df"], changed))
+
+            emptied = {ticker: EMPTY_HASH for ticker in tickers if ticker not in hashes}
+            cleared = [
+                ticker
+                for ticker in emptied
+                if stored.get((ticker, table), (None,))[0] != EMPTY_HASH
+            ]
+            if cleared:
+                delete_df_rows(f"{table}_df", connection, cleared)
+                written.append(([f"{table}_df"], cleared))
+            save_hashes(connection, table, {**hashes, **emptied})
+
+            if table == "overview" and not df.empty:
+                signals = hash_by_symbol(df.drop(columns="market_cap", errors="ignore"))
+                save_hashes(connection, "signal", signals)
+
+    for tables, symbols in written:
+        notify_tables_written(tables, symbols)
+
+
+def to_pg_type(dtype) -> str:
+    """Map a pandas dtype to the Postgres type used when a column is created."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "TIMESTAMPTZ"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def ensure_columns(
+    connection: Connection, table: str, schema: str, columns: dict[str, str]
+) -> None:
+    """Create the table, or add the columns it is missing, with the given types.
+
+    Existing columns are never altered, so a column keeps the type it was
+    created with even when a later frame infers a different dtype for it.
+    """
+    existing = get_column_types(connection, table, schema)
+    if not existing:
+        definition = ", ".join(
+            f'"{column}" {column_type}' for column, column_type in columns.items()
+        )
+        connection.execute(text(f'CREATE TABLE {schema}."{table}" ({definition})'))
+        return
+
+    for column, column_type in columns.items():
+        if column not in existing:
+            connection.execute(
+                text(
+                    f'ALTER TABLE {schema}."{table}" '
+                    f'ADD COLUMN "{column}" {column_type}'
+                )
+            )
 
 
-def preprocess_officers(officers_list: list) -> pd.DataFrame:
-    df = pd.concat(officers_list, ignore_index=True)
-    df = df.dropna(subset=["officer_name"])
-    df = df.fillna("")
-    df = (
-        df.groupby(["symbol", "officer_name"])
-        .agg(
-            {
-                "officer_position": lambda x: ", ".join(
-                    sorted(
-                        {
-                            pos.strip()
-                            for pos in x
-                            if isinstance(pos, str) and pos.strip()
-                        },
-                    ),
-                ),
-                "officer_own_percent": "first",
-            }
+def widen_integer_columns(
+    connection: Connection, table: str, schema: str, df: pd.DataFrame
+) -> dict[str, str]:
+    """Retype to DOUBLE PRECISION the integer columns of a table for which the
+    frame holds fractional values, and return the table's column types.
+
+    A column created as BIGINT from a frame of whole numbers would otherwise
+    truncate the fractional values of later frames.
+    """
+    column_types = get_column_types(connection, table, schema)
+    for column in df.columns:
+        if column_types.get(str(column)) not in INTEGER_TYPES:
+            continue
+        if not pd.api.types.is_float_dtype(df[column]):
+            continue
+        values = df[column].dropna()
+        if (values != values.round()).any():
+            connection.execute(
+                text(
+                    f'ALTER TABLE {schema}."{table}" '
+                    f'ALTER COLUMN "{column}" TYPE DOUBLE PRECISION'
+                )
+            )
+            column_types[str(column)] = "double precision"
+    return column_types
+
+
+def bulk_write_df(
+    df: pd.DataFrame,
+    table: str,
+    connection: Connection,
+    schema: str = "tickers",
+    if_exists: str = "replace",
+) -> None:
+    """Write a DataFrame with `COPY FROM STDIN` from an in-memory CSV buffer.
+
+    Unlike `DataFrame.to_sql(if_exists="replace")`, "replace" truncates the
+    table instead of dropping it, so column types, keys and indexes survive
+    between runs. The write joins the caller's transaction.
+
+    Args:
+        df (pd.DataFrame): frame to write
+        table (str): target table name
+        connection (Connection): open SQLAlchemy connection
+        schema (str, optional): target schema. Defaults to "tickers".
+        if_exists (str, optional): "replace" to truncate before writing or
+            "append" to keep existing rows. Defaults to "replace".
+    """
+    ensure_columns(
+        connection,
+        table,
+        schema,
+        {str(column): to_pg_type(dtype) for column, dtype in df.dtypes.items()},
+    )
+
+    if if_exists == "replace":
+        connection.execute(text(f'TRUNCATE {schema}."{table}"'))
+
+    if df.empty:
+        return
+
+    # Integer columns come back as floats once a frame has missing values.
+    # Columns with fractional values were widened, so the rest are whole.
+    column_types = widen_integer_columns(connection, table, schema, df)
+    float_to_int = {
+        column: "Int64"
+        for column in df.columns
+        if column_types.get(str(column)) in INTEGER_TYPES
+        and pd.api.types.is_float_dtype(df[column])
+    }
+    if float_to_int:
+        df = df.astype(float_to_int)
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep="\\N")
+    buffer.seek(0)
+
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {schema}."{table}" ({columns}) FROM STDIN '
+            "WITH (FORMAT csv, NULL '\\N')",
+            buffer,
         )
-        .reset_index()
+
+
+def upsert_df(
+    df: pd.DataFrame,
+    table: str,
+    connection: Connection,
+    symbols: list[str],
+    schema: str = "tickers",
+) -> None:
+    """Replace the rows of the given symbols in a live table, in place.
+
+    The frame is copied into a temporary table first. Tables with one row per
+    symbol are then written with `INSERT ... ON CONFLICT DO UPDATE`; the rows
+    of other tables are deleted per symbol and reinserted. The write joins the
+    caller's transaction.
+    """
+    if df.empty:
+        return
+
+    key = table_key(table)
+    if key:
+        df = df.drop_duplicates(subset=key, keep="last")
+
+    ensure_columns(
+        connection,
+        table,
+        schema,
+        {str(column): to_pg_type(dtype) for column, dtype in df.dtypes.items()},
     )
-    df["officer_own_percent"] = pd.to_numeric(
-        df["officer_own_percent"], errors="coerce"
+    widen_integer_columns(connection, table, schema, df)
+    apply_table_schema(connection, table, schema)
+
+    changes = f"{table}_changes"
+    connection.execute(
+        text(
+            f'CREATE TEMP TABLE "{changes}" '
+            f'(LIKE {schema}."{table}" INCLUDING DEFAULTS) ON COMMIT DROP'
+        )
+    )
+    bulk_write_df(df, changes, connection, schema="pg_temp", if_exists="append")
+
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    if key:
+        updates = ", ".join(
+            f'"{column}" = EXCLUDED."{column}"'
+            for column in df.columns
+            if column != key
+        )
+        connection.execute(
+            text(f"""
+                INSERT INTO {schema}."{table}" ({columns})
+                SELECT {columns} FROM pg_temp."{changes}"
+                ON CONFLICT ("{key}") DO UPDATE SET {updates}
+            """)
+        )
+    else:
+        connection.execute(
+            text(f'DELETE FROM {schema}."{table}" WHERE symbol = ANY(:symbols)'),
+            {"symbols": list(symbols)},
+        )
+        connection.execute(
+            text(
+                f'INSERT INTO {schema}."{table}" ({columns}) '
+                f'SELECT {columns} FROM pg_temp."{changes}"'
+            )
+        )
+
+
+def delete_df_rows(
+    table: str,
+    connection: Connection,
+    symbols: list[str],
+    schema: str = "tickers",
+) -> None:
+    """Delete the rows of the given symbols from a live table, in the caller's
+    transaction."""
+    if not symbols:
+        return
+    connection.execute(
+        text(f'DELETE FROM {schema}."{table}" WHERE symbol = ANY(:symbols)'),
+        {"symbols": list(symbols)},
     )
-    df["officer_own_percent"] = (df["officer_own_percent"] * 100).round(2)
-    df = df.sort_values(by="officer_own_percent", ascending=False)
 
-    return df
+
+def prune_df(
+    table: str,
+    connection: Connection,
+    keep: list[str],
+    schema: str = "tickers",
+) -> int:
+    """Delete the rows of a live table whose symbol is not in `keep`, and
+    return how many were deleted.
+
+    Nothing is deleted when `keep` is empty, which is what a failed fetch
+    returns. The delete joins the caller's transaction.
+    """
+    if not keep:
+        return 0
+    result = connection.execute(
+        text(f'DELETE FROM {schema}."{table}" WHERE NOT (symbol = ANY(:symbols))'),
+        {"symbols": list(keep)},
+    )
+    return result.rowcount
 
 
 def fetch_stats_df() -> list:
-    screener = Screener(source="TCBS")
     default_params = {
         "exchangeName": "HOSE,HNX",
         "marketCap": (2000, 99999999999),
     }
-    df = screener.stock(default_params, limit=1700, lang="en")
+    df = resilient_call(
+        "TCBS",
+        "screener.stock",
+        lambda: get_provider().screener(default_params, limit=1700, source="TCBS"),
+    )
     return df[
         [
             "ticker",
+            "market_cap",
             "roe",
             "roa",
             "ev_ebitda",
@@ -268,11 +809,15 @@ def fetch_stats_df() -> list:
             "ev",
             "rsi14",
         ]
-    ]
+    ].rename(columns={"ticker": "symbol"})
 
 
 def load_price_df(tickers: list[str]) -> pd.DataFrame:
-    df = Trading(source="vci", symbol="ACB").price_board(symbols_list=tickers)
+    df = resilient_call(
+        "VCI",
+        "trading.price_board",
+        lambda: get_provider().price_board(tickers, source="VCI"),
+    )
     df.columns = df.columns.droplevel(0)
     df = df.drop("exchange", axis=1)
     df = df.loc[:, ~df.columns.duplicated()]
@@ -310,44 +855,114 @@ def load_historical_data(
     end=(date.today() + timedelta(days=1)).strftime("%Y-%m-%d"),
     interval="15m",
 ) -> pd.DataFrame:
-    stock = Vnstock().stock(symbol=symbol, source="TCBS")
-    df = stock.quote.history(start=start, end=end, interval=interval)
+    df = resilient_call(
+        "TCBS",
+        "quote.history",
+        lambda: get_provider().history(symbol, start, end, interval, source="TCBS"),
+    )
     return df.drop_duplicates(keep="last")
 
 
-def fetch_company_data(symbol: str) -> dict[dict]:
-    """Fetch all company data tables for a given ticker from the tickers schema.
+# Company datasets served to the ticker, compare and cart pages, and the
+# columns whose dates come back as ISO strings from the JSON aggregation
+COMPANY_TABLES = (
+    "overview",
+    "shareholders",
+    "events",
+    "news",
+    "profile",
+    "officers",
+    "price",
+)
+DATE_COLUMNS = {"news": ("publish_date",)}
 
-    Returns a dict with dataframes for each data type.
+
+def company_data_query(tables: tuple[str, ...]) -> TextClause:
+    """Build one query returning the rows of every table for a set of symbols.
+
+    Each table is aggregated to a JSON array in its own column, so all the
+    datasets come back in a single row and a single round-trip.
     """
-    tables = [
-        "overview",
-        "shareholders",
-        "events",
-        "news",
-        "profile",
-        "officers",
-        "price",
-    ]
+    columns = ",\n".join(
+        f"(SELECT COALESCE(json_agg(t), '[]'::json) FROM tickers.{table}_df AS t "
+        f"WHERE t.symbol = ANY(:symbols)) AS {table}"
+        for table in tables
+    )
+    return text(f"SELECT {columns}")
+
+
+def split_company_data(
+    row, symbols: list[str], tables: tuple[str, ...]
+) -> dict[str, dict[str, pd.DataFrame]]:
+    """Split the aggregated rows of each table into one frame per symbol."""
+    result = {symbol: {} for symbol in symbols}
+    for table in tables:
+        records = row[table]
+        if isinstance(records, str):
+            records = json.loads(records)
+        df = pd.DataFrame.from_records(records)
+        for column in DATE_COLUMNS.get(table, ()):
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column])
+
+        groups = dict(tuple(df.groupby("symbol", sort=False))) if not df.empty else {}
+        for symbol in symbols:
+            result[symbol][table] = (
+                groups[symbol].reset_index(drop=True)
+                if symbol in groups
+                else pd.DataFrame()
+            )
+    return result
+
+
+def empty_company_data(
+    symbols: list[str], tables: tuple[str, ...]
+) -> dict[str, dict[str, pd.DataFrame]]:
+    return {symbol: {table: pd.DataFrame() for table in tables} for symbol in symbols}
+
 
-    result = {}
+def fetch_companies_data(
+    symbols: list[str], tables: tuple[str, ...] = COMPANY_TABLES
+) -> dict[str, dict[str, pd.DataFrame]]:
+    """Fetch company data tables for several tickers in one round-trip.
 
+    Returns a dict of dataframes per data type, for each symbol. Symbols
+    missing from a table get an empty dataframe.
+    """
+    symbols = list(dict.fromkeys(symbols))
     try:
-        for table in tables:
-            try:
-                df = pd.read_sql(
-                    text(f"SELECT * FROM tickers.{table}_df WHERE symbol = :symbol"),
-                    db_settings.conn,
-                    params={"symbol": symbol},
-                )
-                result[table] = df if not df.empty else pd.DataFrame()
-            except Exception as e:
-                print(f"Error fetching {table} data for {symbol}: {e}")
-                result[table] = pd.DataFrame()
+        with db_settings.conn.connect() as connection:
+            row = (
+                connection.execute(company_data_query(tables), {"symbols": symbols})
+                .mappings()
+                .one()
+            )
     except Exception as e:
-        print(f"Error fetching company data for {symbol}: {e}")
-        # Return empty dataframes for all tables
-        for table in tables:
-            result[table] = pd.DataFrame()
+        print(f"Error fetching company data for {', '.join(symbols)}: {e}")
+        return empty_company_data(symbols, tables)
+    return split_company_data(row, symbols, tables)
 
-    return result
+
+async def fetch_companies_data_async(
+    symbols: list[str], tables: tuple[str, ...] = COMPANY_TABLES
+) -> dict[str, dict[str, pd.DataFrame]]:
+    """Async variant of `fetch_companies_data` for Reflex event handlers."""
+    symbols = list(dict.fromkeys(symbols))
+    try:
+        async with async_engine.connect() as connection:
+            result = await connection.execute(
+                company_data_query(tables), {"symbols": symbols}
+            )
+            row = result.mappings().one()
+    except Exception as e:
+        print(f"Error fetching company data for {', '.join(symbols)}: {e}")
+        return empty_company_data(symbols, tables)
+    return split_company_data(row, symbols, tables)
+
+
+def fetch_company_data(symbol: str) -> dict[str, pd.DataFrame]:
+    """Fetch all company data tables for a given ticker from the tickers schema.
+
+    Returns a dict with dataframes for each data type.
+    """
+    return fetch_companies_data([symbol])[symbol]
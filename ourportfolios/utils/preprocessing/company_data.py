@@ -0,0 +1,121 @@
+"""Preprocessing of the fetched company datasets.
+
+The refresh pipeline runs `preprocess_company` for every fetched ticker on the
+preprocessing process pool, while the next tickers are still being fetched.
+This module only depends on pandas so worker processes start quickly.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from ..preprocess_texts import process_events_for_display
+
+
+def preprocess_overview(overview_list: list) -> pd.DataFrame:
+    df = pd.concat(overview_list, ignore_index=True)
+    df["website"] = (
+        df["website"].str.removeprefix("https://").str.removeprefix("http://")
+    )
+    df["foreign_percent"] = round(df["foreign_percent"] * 100, 2)
+    df = df.drop(
+        [
+            "industry_id",
+            "industry_id_v2",
+            "delta_in_year",
+            "delta_in_month",
+            "delta_in_week",
+            "stock_rating",
+            "company_type",
+        ],
+        axis=1,
+    )
+
+    return df
+
+
+def preprocess_shareholders(shareholders_list: list) -> pd.DataFrame:
+    df = pd.concat(shareholders_list, ignore_index=True)
+    df["share_own_percent"] = (df["share_own_percent"] * 100).round(2)
+    return df
+
+
+def preprocess_profile(profile_list: list) -> pd.DataFrame:
+    df = pd.concat(profile_list, ignore_index=True)
+    return df
+
+
+def preprocess_events(events_list: list) -> pd.DataFrame:
+    df = pd.concat(events_list, ignore_index=True)
+    df["price_change_ratio"] = df["price_change_ratio"].fillna(np.nan)
+    df["price_change_ratio"] = (df["price_change_ratio"] * 100).round(2)
+
+    df = pd.DataFrame(process_events_for_display(df.to_dict("records")))
+    df = df[["symbol", "event_name", "price_change_ratio", "event_desc"]]
+    return df
+
+
+def preprocess_news(news_list: list) -> pd.DataFrame:
+    df = pd.concat(news_list, ignore_index=True)
+
+    df["price_change_ratio"] = pd.to_numeric(df["price_change_ratio"], errors="coerce")
+    df = df[~df["title"].str.contains("insider", case=False, na=False)]
+    df["price_change_ratio"] = (df["price_change_ratio"] * 100).round(2)
+    df = df[["symbol", "title", "publish_date", "price_change_ratio"]]
+    return df
+
+
+def preprocess_officers(officers_list: list) -> pd.DataFrame:
+    df = pd.concat(officers_list, ignore_index=True)
+    df = df.dropna(subset=["officer_name"])
+    df = df.fillna("")
+
+    # One row per officer, with their distinct positions sorted and joined
+    keys = ["symbol", "officer_name"]
+    own_percent = df.groupby(keys)["officer_own_percent"].first()
+    positions = df[keys].assign(
+        officer_position=df["officer_position"].astype(str).str.strip()
+    )
+    positions = (
+        positions[positions["officer_position"] != ""]
+        .drop_duplicates()
+        .sort_values("officer_position")
+        .groupby(keys)["officer_position"]
+        .agg(", ".join)
+    )
+    df = (
+        own_percent.to_frame()
+        .join(positions)
+        .fillna({"officer_position": ""})
+        .reset_index()[keys + ["officer_position", "officer_own_percent"]]
+    )
+
+    df["officer_own_percent"] = pd.to_numeric(
+        df["officer_own_percent"], errors="coerce"
+    )
+    df["officer_own_percent"] = (df["officer_own_percent"] * 100).round(2)
+    df = df.sort_values(by="officer_own_percent", ascending=False)
+
+    return df
+
+
+PREPROCESSORS = {
+    "overview": preprocess_overview,
+    "shareholders": preprocess_shareholders,
+    "events": preprocess_events,
+    "news": preprocess_news,
+    "profile": preprocess_profile,
+    "officers": preprocess_officers,
+}
+
+
+def preprocess_company(
+    ticker: str, frames: Dict[str, pd.DataFrame]
+) -> tuple[str, Dict[str, pd.DataFrame]]:
+    """Preprocess the fetched datasets of one ticker, skipping empty ones."""
+    return ticker, {
+        endpoint: PREPROCESSORS[endpoint]([df])
+        for endpoint, df in frames.items()
+        if df is not None and not df.empty
+    }
@@ -1,8 +1,10 @@
-from vnstock import Vnstock
 import pandas as pd
 import asyncio
 from datetime import datetime, timedelta
 
+from ..providers import get_provider
+from ..resilience import resilient_call
+
 # Simple in-memory cache with timestamp
 _cache = {}
 _cache_duration = timedelta(minutes=30)  # Cache for 30 minutes
@@ -31,24 +33,34 @@ async def get_transformed_dataframes(ticker_symbol, period="year"):
             key_ratios_raw,
         ) = await asyncio.gather(
             asyncio.to_thread(
-                lambda: Vnstock()
-                .stock(symbol=ticker_symbol, source="VCI")
-                .finance.income_statement(period=period, lang="en")
+                resilient_call,
+                "VCI",
+                "finance.income_statement",
+                lambda: get_provider().finance(
+                    ticker_symbol, "income_statement", period, "VCI"
+                ),
             ),
             asyncio.to_thread(
-                lambda: Vnstock()
-                .stock(symbol=ticker_symbol, source="VCI")
-                .finance.balance_sheet(period=period, lang="en")
+                resilient_call,
+                "VCI",
+                "finance.balance_sheet",
+                lambda: get_provider().finance(
+                    ticker_symbol, "balance_sheet", period, "VCI"
+                ),
             ),
             asyncio.to_thread(
-                lambda: Vnstock()
-                .stock(symbol=ticker_symbol, source="VCI")
-                .finance.cash_flow(period=period, lang="en")
+                resilient_call,
+                "VCI",
+                "finance.cash_flow",
+                lambda: get_provider().finance(
+                    ticker_symbol, "cash_flow", period, "VCI"
+                ),
             ),
             asyncio.to_thread(
-                lambda: Vnstock()
-                .stock(symbol=ticker_symbol, source="VCI")
-                .finance.ratio(period=period, lang="en")
+                resilient_call,
+                "VCI",
+                "finance.ratio",
+                lambda: get_provider().finance(ticker_symbol, "ratio", period, "VCI"),
             ),
         )
     except Exception as e:
@@ -0,0 +1,199 @@
+"""Pluggable market data providers.
+
+Every data path asks `get_provider()` for its DataFrames instead of calling
+vnstock directly. Three providers are available, chosen by `DATA_PROVIDER`:
+
+- "vnstock": the live vnstock API (default)
+- "record": the live API, saving every DataFrame it returns under `REPLAY_DIR`
+- "replay": serves the DataFrames recorded under `REPLAY_DIR` with a synthetic
+  latency of `REPLAY_LATENCY` seconds, so the refresh pipeline and page loads
+  can be profiled on a machine with no network
+"""
+
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+from vnstock import Screener, Trading, Vnstock
+
+from .scheduler import db_settings
+
+
+class DataProvider(ABC):
+    """Source of the market data DataFrames used by the app."""
+
+    @abstractmethod
+    def company(self, symbol: str, endpoint: str, source: str = "TCBS") -> pd.DataFrame:
+        """Company dataset of a ticker, e.g. "overview" or "news"."""
+
+    @abstractmethod
+    def screener(
+        self, params: Dict[str, Any], limit: int, source: str = "TCBS"
+    ) -> pd.DataFrame:
+        """Screener statistics of every ticker matching `params`."""
+
+    @abstractmethod
+    def price_board(self, symbols: List[str], source: str = "VCI") -> pd.DataFrame:
+        """Current price board of the given tickers."""
+
+    @abstractmethod
+    def history(
+        self, symbol: str, start: str, end: str, interval: str, source: str = "TCBS"
+    ) -> pd.DataFrame:
+        """Price history of a ticker between two dates."""
+
+    @abstractmethod
+    def finance(
+        self, symbol: str, report: str, period: str, source: str = "VCI"
+    ) -> pd.DataFrame:
+        """Financial report of a ticker, e.g. "balance_sheet" or "ratio"."""
+
+
+class VnstockProvider(DataProvider):
+    """Live data from the vnstock API."""
+
+    def company(self, symbol, endpoint, source="TCBS"):
+        company = Vnstock().stock(symbol=symbol, source=source).company
+        return getattr(company, endpoint)()
+
+    def screener(self, params, limit, source="TCBS"):
+        return Screener(source=source).stock(params, limit=limit, lang="en")
+
+    def price_board(self, symbols, source="VCI"):
+        return Trading(source=source.lower(), symbol="ACB").price_board(
+            symbols_list=symbols
+        )
+
+    def history(self, symbol, start, end, interval, source="TCBS"):
+        stock = Vnstock().stock(symbol=symbol, source=source)
+        return stock.quote.history(start=start, end=end, interval=interval)
+
+    def finance(self, symbol, report, period, source="VCI"):
+        finance = Vnstock().stock(symbol=symbol, source=source).finance
+        return getattr(finance, report)(period=period, lang="en")
+
+
+def fixture_path(root: Path, method: str, *key: str) -> Path:
+    """Path of the recording of one provider call.
+
+    The key leaves out arguments that change from one day to the next, such
+    as history date ranges or the price board ticker list, so a recording
+    keeps being served as the calendar moves on.
+    """
+    parts = [re.sub(r"[^A-Za-z0-9_.-]", "_", str(part)) for part in key]
+    return root / method / ("__".join(parts) + ".pkl")
+
+
+class RecordingProvider(DataProvider):
+    """Passes calls through to another provider and records the results."""
+
+    def __init__(self, provider: DataProvider, root: str | Path):
+        self.provider = provider
+        self.root = Path(root)
+
+    def _record(self, df: pd.DataFrame, method: str, *key: str) -> pd.DataFrame:
+        path = fixture_path(self.root, method, *key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(path)
+        return df
+
+    def company(self, symbol, endpoint, source="TCBS"):
+        df = self.provider.company(symbol, endpoint, source)
+        return self._record(df, "company", source, endpoint, symbol)
+
+    def screener(self, params, limit, source="TCBS"):
+        df = self.provider.screener(params, limit, source)
+        return self._record(df, "screener", source)
+
+    def price_board(self, symbols, source="VCI"):
+        df = self.provider.price_board(symbols, source)
+        return self._record(df, "price_board", source)
+
+    def history(self, symbol, start, end, interval, source="TCBS"):
+        df = self.provider.history(symbol, start, end, interval, source)
+        return self._record(df, "history", source, interval, symbol)
+
+    def finance(self, symbol, report, period, source="VCI"):
+        df = self.provider.finance(symbol, report, period, source)
+        return self._record(df, "finance", source, report, period, symbol)
+
+
+class ReplayProvider(DataProvider):
+    """Serves recorded DataFrames from disk after a synthetic latency.
+
+    Each call sleeps `latency` seconds, spread uniformly by +/- `jitter` of
+    that latency. Calls without a recording raise `FileNotFoundError`.
+    """
+
+    def __init__(self, root: str | Path, latency: float = 0.0, jitter: float = 0.25):
+        self.root = Path(root)
+        self.latency = latency
+        self.jitter = jitter
+        self._frames: Dict[Tuple[str, ...], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _replay(self, method: str, *key: str) -> pd.DataFrame:
+        if self.latency > 0:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+        cache_key = (method, *key)
+        with self._lock:
+            if cache_key not in self._frames:
+                path = fixture_path(self.root, method, *key)
+                if not path.exists():
+                    raise FileNotFoundError(f"No recording at {path}")
+                self._frames[cache_key] = pd.read_pickle(path)
+            return self._frames[cache_key].copy()
+
+    def company(self, symbol, endpoint, source="TCBS"):
+        return self._replay("company", source, endpoint, symbol)
+
+    def screener(self, params, limit, source="TCBS"):
+        return self._replay("screener", source).head(limit)
+
+    def price_board(self, symbols, source="VCI"):
+        return self._replay("price_board", source)
+
+    def history(self, symbol, start, end, interval, source="TCBS"):
+        return self._replay("history", source, interval, symbol)
+
+    def finance(self, symbol, report, period, source="VCI"):
+        return self._replay("finance", source, report, period, symbol)
+
+
+_provider: DataProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def make_provider(kind: str) -> DataProvider:
+    """Build the provider named by `kind` from the settings."""
+    if kind == "vnstock":
+        return VnstockProvider()
+    if kind == "record":
+        return RecordingProvider(VnstockProvider(), db_settings.replay_dir)
+    if kind == "replay":
+        return ReplayProvider(
+            db_settings.replay_dir, latency=db_settings.replay_latency
+        )
+    raise ValueError(f"Unknown data provider: {kind}")
+
+
+def get_provider() -> DataProvider:
+    """Return the process-wide data provider."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = make_provider(db_settings.data_provider)
+        return _provider
+
+
+def set_provider(provider: DataProvider) -> None:
+    """Replace the process-wide data provider, e.g. with a replay provider."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,202 @@
+"""Declarative registry of dataset refresh jobs.
+
+Every dataset registers the function that refreshes it together with its
+refresh cadence, the datasets it depends on and its staleness budget. A single
+dispatcher job on `db_scheduler` wakes up every `registry_tick` seconds and
+runs, in dependency order, only the jobs whose cadence has elapsed since their
+last success. The last success of each job is kept in `tickers.refresh_log`
+so cadences survive restarts.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+
+from .scheduler import db_scheduler, db_settings
+
+
+@dataclass(frozen=True)
+class RefreshJob:
+    """A dataset refreshed on its own cadence.
+
+    Attributes:
+        name (str): dataset name, used as the job id
+        refresh (Callable[[], None]): function refreshing the dataset
+        cadence (timedelta): time between two refreshes
+        staleness_budget (timedelta): age after which the dataset is stale.
+            Jobs depending on a stale dataset are held back until it has been
+            refreshed successfully.
+        depends_on (Tuple[str, ...]): datasets refreshed before this one
+    """
+
+    name: str
+    refresh: Callable[[], None]
+    cadence: timedelta
+    staleness_budget: timedelta
+    depends_on: Tuple[str, ...] = ()
+
+
+REFRESH_JOBS: Dict[str, RefreshJob] = {}
+
+
+def refresh_job(
+    name: str,
+    cadence: timedelta,
+    staleness_budget: timedelta | None = None,
+    depends_on: Tuple[str, ...] = (),
+):
+    """Register the decorated function as the refresh job of a dataset.
+
+    The staleness budget defaults to twice the cadence.
+    """
+
+    def decorator(func: Callable[[], None]) -> Callable[[], None]:
+        REFRESH_JOBS[name] = RefreshJob(
+            name=name,
+            refresh=func,
+            cadence=cadence,
+            staleness_budget=staleness_budget or cadence * 2,
+            depends_on=depends_on,
+        )
+        return func
+
+    return decorator
+
+
+def ordered_jobs() -> List[RefreshJob]:
+    """Return the registered jobs with every job after its dependencies."""
+    ordered: List[RefreshJob] = []
+    visiting = set()
+
+    def visit(name: str):
+        if any(job.name == name for job in ordered):
+            return
+        if name in visiting:
+            raise ValueError(f"Refresh job dependency cycle through {name}")
+        visiting.add(name)
+        for dependency in REFRESH_JOBS[name].depends_on:
+            visit(dependency)
+        visiting.discard(name)
+        ordered.append(REFRESH_JOBS[name])
+
+    for name in REFRESH_JOBS:
+        visit(name)
+    return ordered
+
+
+def ensure_refresh_log() -> None:
+    """Create the refresh log table if it does not exist."""
+    with db_settings.conn.begin() as connection:
+        connection.execute(text("CREATE SCHEMA IF NOT EXISTS tickers"))
+        connection.execute(
+            text("""
+                CREATE TABLE IF NOT EXISTS tickers.refresh_log (
+                    job TEXT PRIMARY KEY,
+                    last_success TIMESTAMP,
+                    last_attempt TIMESTAMP NOT NULL,
+                    last_duration DOUBLE PRECISION,
+                    last_error TEXT
+                )
+            """)
+        )
+
+
+def get_last_success() -> Dict[str, datetime]:
+    """Return the time of the last successful refresh of every job."""
+    with db_settings.conn.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT job, last_success FROM tickers.refresh_log "
+                "WHERE last_success IS NOT NULL"
+            )
+        )
+        return {job: last_success for job, last_success in rows}
+
+
+def record_attempt(
+    name: str, started: datetime, duration: float, error: str | None
+) -> None:
+    """Log a refresh attempt, keeping the previous success if it failed."""
+    with db_settings.conn.begin() as connection:
+        connection.execute(
+            text("""
+                INSERT INTO tickers.refresh_log AS log
+                    (job, last_success, last_attempt, last_duration, last_error)
+                VALUES (:job, :last_success, :started, :duration, :error)
+                ON CONFLICT (job) DO UPDATE SET
+                    last_success = COALESCE(EXCLUDED.last_success, log.last_success),
+                    last_attempt = EXCLUDED.last_attempt,
+                    last_duration = EXCLUDED.last_duration,
+                    last_error = EXCLUDED.last_error
+            """),
+            {
+                "job": name,
+                "last_success": started if error is None else None,
+                "started": started,
+                "duration": duration,
+                "error": error,
+            },
+        )
+
+
+def run_refresh_jobs(force: bool = False) -> None:
+    """Run every due refresh job, or every job if `force` is set.
+
+    A job is due once its cadence has elapsed since its last success. A job
+    is skipped while one of its dependencies has never succeeded or is past
+    its staleness budget.
+    """
+    ensure_refresh_log()
+    last_success = get_last_success()
+
+    for job in ordered_jobs():
+        now = datetime.now()
+        last = last_success.get(job.name)
+        if not force and last is not None and now - last < job.cadence:
+            continue
+
+        stale_dependencies = [
+            dependency
+            for dependency in job.depends_on
+            if dependency not in last_success
+            or now - last_success[dependency]
+            > REFRESH_JOBS[dependency].staleness_budget
+        ]
+        if stale_dependencies:
+            print(  # noqa: T201
+                f"Skipping refresh of {job.name}: "
+                f"{', '.join(stale_dependencies)} not fresh"
+            )
+            continue
+
+        if last is not None and now - last > job.staleness_budget:
+            print(  # noqa: T201
+                f"{job.name} is past its staleness budget, last refreshed {last}"
+            )
+
+        error = None
+        started = time.perf_counter()
+        try:
+            job.refresh()
+            last_success[job.name] = now
+        except Exception as e:
+            error = str(e)
+            print(f"Error refreshing {job.name}: {e}")  # noqa: T201
+
+        record_attempt(job.name, now, time.perf_counter() - started, error)
+
+
+@db_scheduler.scheduled_job(
+    trigger="interval",
+    seconds=db_settings.registry_tick,
+    id="run_due_refreshes",
+    jobstore="memory",
+    max_instances=1,
+    coalesce=True,
+)
+def run_due_refreshes() -> None:
+    """Dispatcher job running the refresh jobs that are due."""
+    run_refresh_jobs()
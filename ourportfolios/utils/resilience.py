@@ -0,0 +1,253 @@
+"""Retries, circuit breaking and call metrics for data provider calls.
+
+Every vnstock call goes through `resilient_call`, which retries transient
+failures with exponential backoff and jitter, fails fast while the circuit
+breaker of the call's source (TCBS/VCI) is open, and records per-endpoint
+latency and error counters. Only transient failures (connection errors,
+timeouts, HTTP 408/429/5xx) are retried and count toward the breaker: other
+errors, such as a missing endpoint or unparsable data for one ticker, would
+fail again the same way and say nothing about the source's health. The
+provider call is any zero-argument callable, and the sleep, clock and random
+functions can be swapped, so the layer can be exercised with a fake provider.
+"""
+
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, TypeVar
+
+import requests
+from urllib3 import exceptions as urllib3_exceptions
+
+from .scheduler import db_settings
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying, besides every 5xx
+TRANSIENT_STATUSES = frozenset({408, 429})
+
+# Network errors worth retrying. Other OS errors, such as the
+# FileNotFoundError of a missing replay recording, are not.
+NETWORK_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    requests.ConnectionError,
+    requests.Timeout,
+    urllib3_exceptions.NewConnectionError,
+    urllib3_exceptions.ProtocolError,
+    urllib3_exceptions.TimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its source's circuit is open."""
+
+
+class CircuitBreaker:
+    """Per-source circuit breaker.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    refuses calls for `reset_timeout` seconds. It then lets a single trial
+    call through: a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a call that says nothing about the source's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+
+@dataclass
+class EndpointMetrics:
+    """Call counters and latencies of one provider endpoint."""
+
+    calls: int = 0
+    errors: int = 0
+    non_transient: int = 0
+    retries: int = 0
+    rejected: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_metrics: Dict[str, EndpointMetrics] = {}
+_lock = threading.Lock()
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether an error may go away on retry.
+
+    Errors carrying an HTTP response are transient for 408, 429 and 5xx
+    statuses. Otherwise only the connection errors and timeouts of
+    `NETWORK_ERRORS` are transient.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUSES or status >= 500
+    return isinstance(error, NETWORK_ERRORS)
+
+
+def get_circuit_breaker(source: str) -> CircuitBreaker:
+    """Return the shared circuit breaker of a data source."""
+    source = source.upper()
+    with _lock:
+        if source not in _breakers:
+            _breakers[source] = CircuitBreaker(
+                failure_threshold=db_settings.breaker_failure_threshold,
+                reset_timeout=db_settings.breaker_reset_timeout,
+            )
+        return _breakers[source]
+
+
+def _endpoint_metrics(endpoint: str) -> EndpointMetrics:
+    with _lock:
+        return _metrics.setdefault(endpoint, EndpointMetrics())
+
+
+def get_call_metrics() -> Dict[str, Dict[str, float]]:
+    """Return a snapshot of the counters of every endpoint called so far."""
+    with _lock:
+        return {
+            endpoint: {**asdict(metrics), "mean_latency": metrics.mean_latency}
+            for endpoint, metrics in _metrics.items()
+        }
+
+
+def reset_resilience() -> None:
+    """Forget all circuit breakers and metrics."""
+    with _lock:
+        _breakers.clear()
+        _metrics.clear()
+
+
+def resilient_call(
+    source: str,
+    endpoint: str,
+    func: Callable[[], T],
+    retries: int | None = None,
+    base_delay: float | None = None,
+    max_delay: float | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    jitter: Callable[[float, float], float] = random.uniform,
+    transient: Callable[[Exception], bool] = is_transient,
+) -> T:
+    """Call a data provider with retries and the source's circuit breaker.
+
+    Args:
+        source (str): data source, e.g. "TCBS" or "VCI"
+        endpoint (str): endpoint name the metrics are recorded under
+        func (Callable[[], T]): the provider call
+        retries (int, optional): retries after the first attempt.
+            Defaults to `db_settings.retry_attempts`.
+        base_delay (float, optional): backoff before the first retry, doubled
+            on every retry. Defaults to `db_settings.retry_base_delay`.
+        max_delay (float, optional): backoff cap. Defaults to
+            `db_settings.retry_max_delay`.
+        transient (Callable[[Exception], bool], optional): whether an error
+            is retried and counted by the breaker. Defaults to `is_transient`.
+
+    Raises:
+        CircuitOpenError: if the source's circuit is open
+        Exception: a non-transient error right away, or the provider's last
+            error once retries are exhausted
+    """
+    retries = db_settings.retry_attempts if retries is None else retries
+    base_delay = db_settings.retry_base_delay if base_delay is None else base_delay
+    max_delay = db_settings.retry_max_delay if max_delay is None else max_delay
+
+    breaker = get_circuit_breaker(source)
+    metrics = _endpoint_metrics(endpoint)
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            with _lock:
+                metrics.rejected += 1
+            raise CircuitOpenError(f"Circuit for {source} is open, skipping {endpoint}")
+
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            latency = time.perf_counter() - started
+            retryable = transient(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.release()
+            with _lock:
+                metrics.calls += 1
+                metrics.errors += 1
+                metrics.non_transient += not retryable
+                metrics.total_latency += latency
+                metrics.max_latency = max(metrics.max_latency, latency)
+            if not retryable or attempt == retries:
+                raise
+
+            # Exponential backoff with "equal jitter"
+            delay = min(max_delay, base_delay * 2**attempt)
+            with _lock:
+                metrics.retries += 1
+            sleep(delay / 2 + jitter(0, delay / 2))
+            continue
+
+        latency = time.perf_counter() - started
+        breaker.record_success()
+        with _lock:
+            metrics.calls += 1
+            metrics.total_latency += latency
+            metrics.max_latency = max(metrics.max_latency, latency)
+        return result
@@ -1,28 +1,170 @@
+import concurrent.futures
+import multiprocessing
 import os
+import threading
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 
+from .database import DATABASE_URI, engine
+
 
 # Load environment variables
 load_dotenv()
 
 
 class Settings:
-    connection_string = os.getenv("DATABASE_URI")
-    conn = create_engine(url=connection_string)
+    connection_string = DATABASE_URI
+    conn = engine
 
     interval: int = 60 * 60 * 24
 
+    # How often the refresh job registry checks which datasets are due
+    registry_tick: int = 5 * 60
+
+    # Company crawl concurrency and per-source request budgets as
+    # (requests per second, burst size)
+    fetch_workers: int = int(os.getenv("FETCH_WORKERS", 8))
+    rate_limits: dict[str, tuple[float, int]] = {
+        "TCBS": (float(os.getenv("TCBS_RATE_LIMIT", 5)), 10),
+        "VCI": (float(os.getenv("VCI_RATE_LIMIT", 5)), 10),
+    }
+    default_rate_limit: tuple[float, int] = (1.0, 1)
+
+    # Provider call retries with exponential backoff (seconds), and the
+    # consecutive failures after which a source's circuit opens for
+    # `breaker_reset_timeout` seconds
+    retry_attempts: int = int(os.getenv("RETRY_ATTEMPTS", 3))
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 10.0
+    breaker_failure_threshold: int = 10
+    breaker_reset_timeout: float = 60.0
+
+    # Worker processes preprocessing fetched company data during a refresh
+    preprocess_workers: int = int(os.getenv("PREPROCESS_WORKERS", 2))
+
+    # Market data provider: "vnstock", "record" (vnstock, saving every frame
+    # under `replay_dir`) or "replay" (serving the recorded frames after
+    # `replay_latency` seconds)
+    data_provider: str = os.getenv("DATA_PROVIDER", "vnstock")
+    replay_dir: str = os.getenv("REPLAY_DIR", "fixtures/replay")
+    replay_latency: float = float(os.getenv("REPLAY_LATENCY", 0))
+
+    # Tickers written to the staging area per checkpoint, and how long an
+    # interrupted refresh run stays resumable
+    checkpoint_batch_size: int = 50
+    checkpoint_max_age: int = interval
+
+    # How long the staging swap waits for readers' locks, and how often it
+    # retries before giving up
+    swap_lock_timeout: str = "5s"
+    swap_retries: int = 5
+
+    # Smallest share of a live table's rows its staged table must hold to be
+    # swapped in, so a run where most tickers failed keeps the previous data
+    swap_min_row_share: float = float(os.getenv("SWAP_MIN_ROW_SHARE", 0.5))
+
+    # "full" reloads every table through the staging swap, "differential"
+    # upserts only the tickers whose content hash changed. Slow-moving
+    # endpoints skipped by a differential refresh are refetched at least
+    # every `differential_max_age` seconds.
+    refresh_mode: str = os.getenv("REFRESH_MODE", "full")
+    differential_max_age: int = 60 * 60 * 24 * 7
+
+    # Longest time a worker serves its in-memory screener snapshot before
+    # reloading it, in case the screener was rebuilt by another process
+    screener_snapshot_ttl: int = int(os.getenv("SCREENER_SNAPSHOT_TTL", 60))
+
+    # "memory" serves the ticker board from the in-memory screener snapshot,
+    # "sql" runs a parameterized query on tickers.screener for every change
+    board_backend: str = os.getenv("BOARD_BACKEND", "memory")
+
+    # Board results cached per filter combination by each worker
+    board_cache_size: int = int(os.getenv("BOARD_CACHE_SIZE", 256))
+    board_cache_ttl: int = int(os.getenv("BOARD_CACHE_TTL", 60))
+
+    # Ticker page DataFrames (company tables, price histories) cached per
+    # ticker by each worker, and how long failed fetches stay cached
+    frame_cache_size: int = int(os.getenv("FRAME_CACHE_SIZE", 128))
+    frame_cache_ttl: int = int(os.getenv("FRAME_CACHE_TTL", 300))
+    frame_cache_failure_ttl: int = int(os.getenv("FRAME_CACHE_FAILURE_TTL", 30))
+
+    # Board rows sent to the client at first, and added each time the user
+    # scrolls near the end of the list
+    board_page_size: int = int(os.getenv("BOARD_PAGE_SIZE", 50))
+
+    # Search bar suggestions shown per search, and how long the server waits
+    # for typing to pause before looking them up, in seconds
+    suggestion_limit: int = int(os.getenv("SUGGESTION_LIMIT", 10))
+    suggestion_debounce: float = float(os.getenv("SUGGESTION_DEBOUNCE", 0.15))
+
+    # Intraday price board refresh, only run during HOSE/HNX trading
+    # sessions plus a grace period to capture the closing prices
+    price_interval: int = int(os.getenv("PRICE_INTERVAL", 30))
+    market_timezone: ZoneInfo = ZoneInfo("Asia/Ho_Chi_Minh")
+    market_sessions: tuple[tuple[time, time], ...] = (
+        (time(9, 0), time(11, 30)),
+        (time(13, 0), time(15, 0)),
+    )
+    market_close_grace: int = 5 * 60
+
 
 db_settings = Settings()
 
-# DB scheduler
-executors = {"default": ThreadPoolExecutor(2), "processpool": ProcessPoolExecutor(2)}
-db_jobstores = {"default": SQLAlchemyJobStore(url=db_settings.connection_string)}
+
+def is_market_open(now: datetime | None = None) -> bool:
+    """Whether the market is in a trading session (or just closed one)."""
+    now = (now or datetime.now(db_settings.market_timezone)).astimezone(
+        db_settings.market_timezone
+    )
+    if now.weekday() >= 5:
+        return False
+
+    seconds = now.hour * 3600 + now.minute * 60 + now.second
+    for start, end in db_settings.market_sessions:
+        start_seconds = start.hour * 3600 + start.minute * 60
+        end_seconds = end.hour * 3600 + end.minute * 60
+        if start_seconds <= seconds <= end_seconds + db_settings.market_close_grace:
+            return True
+    return False
+
+
+# DB scheduler. The price board job gets its own executor so it never queues
+# behind the long company crawl, and an in-memory job store since it does not
+# need to survive restarts.
+executors = {
+    "default": ThreadPoolExecutor(2),
+    "prices": ThreadPoolExecutor(1),
+}
+db_jobstores = {
+    "default": SQLAlchemyJobStore(engine=db_settings.conn),
+    "memory": MemoryJobStore(),
+}
 db_scheduler = BackgroundScheduler(executors=executors, jobstores=db_jobstores)
 
+# Process pool of the refresh preprocessing stage. APScheduler executors only
+# run scheduled jobs, so the per-ticker chunks get a plain process pool. It is
+# created on first use and spawns its workers, as forking the threaded
+# scheduler process is unsafe.
+_preprocess_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_preprocess_pool_lock = threading.Lock()
+
+
+def get_preprocess_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared preprocessing process pool."""
+    global _preprocess_pool
+    with _preprocess_pool_lock:
+        if _preprocess_pool is None:
+            _preprocess_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=db_settings.preprocess_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _preprocess_pool
+
+
 # internal sheduler
 local_scheduler = BackgroundScheduler(executors=executors)
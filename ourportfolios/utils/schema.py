@@ -0,0 +1,199 @@
+"""Declared keys and indexes of the tickers tables, and their migrations.
+
+The loader infers the columns of each table from the fetched data, but its
+primary key and indexes are declared here. They are applied to every staged
+table before it is swapped in and to live tables written in place, so they
+survive refreshes. Changes to live tables go through `MIGRATIONS`, and the
+migrations applied so far are recorded in `tickers.schema_version`.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import Connection, text
+
+from .scheduler import db_settings
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Keys and indexes of a table.
+
+    Attributes:
+        primary_key (str | None): column holding one row per value, if any
+        indexes (Tuple[str, ...]): columns with a lookup index
+    """
+
+    primary_key: str | None = None
+    indexes: Tuple[str, ...] = ()
+
+
+# Screener metrics the ticker board filters and sorts on
+SCREENER_METRICS: Tuple[str, ...] = (
+    "market_cap",
+    "roe",
+    "roa",
+    "ev_ebitda",
+    "dividend_yield",
+    "gross_margin",
+    "net_margin",
+    "doe",
+    "alpha",
+    "beta",
+    "pe",
+    "pb",
+    "eps",
+    "ps",
+    "ev",
+    "rsi14",
+)
+
+TICKERS_SCHEMA: Dict[str, TableSchema] = {
+    "overview_df": TableSchema("symbol", ("industry", "exchange", "market_cap")),
+    "profile_df": TableSchema("symbol"),
+    "stats_df": TableSchema("symbol", SCREENER_METRICS),
+    "price_df": TableSchema("symbol", ("accumulated_volume", "pct_price_change")),
+    "shareholders_df": TableSchema(indexes=("symbol",)),
+    "events_df": TableSchema(indexes=("symbol",)),
+    "news_df": TableSchema(indexes=("symbol",)),
+    "officers_df": TableSchema(indexes=("symbol",)),
+    "screener": TableSchema(
+        "symbol",
+        ("industry", "exchange", "accumulated_volume", "pct_price_change")
+        + SCREENER_METRICS,
+    ),
+}
+
+
+def table_key(table: str) -> str | None:
+    """Return the primary key column of a table, if it has one."""
+    schema = TICKERS_SCHEMA.get(table)
+    return schema.primary_key if schema else None
+
+
+def get_column_types(connection: Connection, table: str, schema: str) -> dict[str, str]:
+    """Return the declared Postgres type of each column of a table, in order.
+
+    Returns an empty dict if the table does not exist.
+    """
+    rows = connection.execute(
+        text("""
+            SELECT attname, format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = to_regclass(:name) AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum
+        """),
+        {"name": f'{schema}."{table}"'},
+    )
+    return {name: column_type for name, column_type in rows}
+
+
+def has_primary_key(connection: Connection, table: str, schema: str) -> bool:
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:name) AND contype = 'p'"
+            ),
+            {"name": f'{schema}."{table}"'},
+        ).scalar()
+    )
+
+
+def apply_table_schema(connection: Connection, table: str, schema: str) -> None:
+    """Create the declared primary key and indexes of a table, if missing.
+
+    Declared columns the table does not have are skipped.
+    """
+    declared = TICKERS_SCHEMA.get(table)
+    if declared is None:
+        return
+    columns = get_column_types(connection, table, schema)
+
+    key = declared.primary_key
+    if key in columns and not has_primary_key(connection, table, schema):
+        connection.execute(
+            text(
+                f'ALTER TABLE {schema}."{table}" '
+                f'ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("{key}")'
+            )
+        )
+
+    for column in declared.indexes:
+        if column in columns and column != key:
+            connection.execute(
+                text(
+                    f'CREATE INDEX IF NOT EXISTS "{table}_{column}_idx" '
+                    f'ON {schema}."{table}" ("{column}")'
+                )
+            )
+
+
+def _rename_stats_ticker(connection: Connection) -> None:
+    """Key the stats table on `symbol` like every other table."""
+    columns = get_column_types(connection, "stats_df", "tickers")
+    if "ticker" in columns and "symbol" not in columns:
+        connection.execute(
+            text('ALTER TABLE tickers.stats_df RENAME COLUMN "ticker" TO "symbol"')
+        )
+        connection.execute(text('DROP INDEX IF EXISTS tickers."stats_df_ticker_key"'))
+
+
+def _declare_keys(connection: Connection) -> None:
+    """Replace the unique indexes of live tables by the declared keys."""
+    for table, declared in TICKERS_SCHEMA.items():
+        columns = get_column_types(connection, table, "tickers")
+        key = declared.primary_key
+        if key in columns:
+            # Tables written by to_sql may hold duplicate or missing keys
+            connection.execute(
+                text(f'DELETE FROM tickers."{table}" WHERE "{key}" IS NULL')
+            )
+            connection.execute(
+                text(f"""
+                    DELETE FROM tickers."{table}" AS older
+                    USING tickers."{table}" AS newer
+                    WHERE older."{key}" = newer."{key}" AND older.ctid < newer.ctid
+                """)
+            )
+        apply_table_schema(connection, table, "tickers")
+        if key:
+            connection.execute(
+                text(f'DROP INDEX IF EXISTS tickers."{table}_{key}_key"')
+            )
+
+
+# Ordered migrations of the live tables. Append new ones, never edit applied ones.
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _rename_stats_ticker,
+    _declare_keys,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate_schema() -> None:
+    """Apply the migrations the live tables have not been through yet."""
+    with db_settings.conn.begin() as connection:
+        connection.execute(text("CREATE SCHEMA IF NOT EXISTS tickers"))
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('tickers.schema_version'))")
+        )
+        connection.execute(
+            text("""
+                CREATE TABLE IF NOT EXISTS tickers.schema_version (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TIMESTAMP NOT NULL DEFAULT now()
+                )
+            """)
+        )
+        current = connection.execute(
+            text("SELECT COALESCE(MAX(version), 0) FROM tickers.schema_version")
+        ).scalar_one()
+
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[version - 1](connection)
+            connection.execute(
+                text("INSERT INTO tickers.schema_version (version) VALUES (:version)"),
+                {"version": version},
+            )
+            print(f"Applied tickers schema migration {version}")  # noqa: T201
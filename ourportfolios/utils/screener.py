@@ -0,0 +1,108 @@
+"""Denormalized screener table behind the ticker board.
+
+`tickers.screener` holds one row per symbol with every column the board shows,
+filters or sorts on, so the board reads a single indexed table instead of
+joining the price, profile, overview and stats tables on every recompute.
+
+It is a plain table rather than a materialized view: the refresh swaps its
+source tables in by dropping the old ones, which a view depending on them
+would block. The loader rebuilds it in the same transaction as every write to
+a source table, so readers never see it out of step with them. Callbacks
+registered with `on_screener_refresh` run once such a transaction commits,
+so in-process copies of the screener can be dropped or reloaded.
+"""
+
+from typing import Callable, List
+
+from sqlalchemy import Connection, text
+
+from .schema import SCREENER_METRICS, apply_table_schema, get_column_types
+
+SCREENER_TABLE = "screener"
+
+# Tables the screener is built from
+SCREENER_SOURCES = ("price_df", "profile_df", "overview_df", "stats_df")
+
+# Screener metrics read from the stats table; market_cap comes from overview
+STATS_COLUMNS = ", ".join(
+    f"sd.{metric}" for metric in SCREENER_METRICS if metric != "market_cap"
+)
+
+SCREENER_SELECT = f"""
+    SELECT
+        pb.symbol,
+        pd.company_name,
+        od.industry,
+        od.exchange,
+        od.market_cap,
+        pb.current_price,
+        pb.price_change,
+        pb.pct_price_change,
+        pb.accumulated_volume,
+        {STATS_COLUMNS}
+    FROM tickers.price_df AS pb
+    JOIN tickers.profile_df AS pd ON pb.symbol = pd.symbol
+    JOIN tickers.overview_df AS od ON pb.symbol = od.symbol
+    LEFT JOIN tickers.stats_df AS sd ON pb.symbol = sd.symbol
+"""
+
+
+_refresh_listeners: List[Callable[[], None]] = []
+
+
+def on_screener_refresh(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run after every committed screener rebuild."""
+    _refresh_listeners.append(callback)
+    return callback
+
+
+def notify_screener_refresh() -> None:
+    """Run the registered screener refresh callbacks.
+
+    Called once the transaction that rebuilt the screener has committed.
+    """
+    for callback in _refresh_listeners:
+        try:
+            callback()
+        except Exception as e:
+            print(  # noqa: T201
+                f"Error in screener refresh callback {callback.__name__}: {e}"
+            )
+
+
+def refresh_screener(connection: Connection) -> bool:
+    """Rebuild the screener table from its sources, in the caller's transaction.
+
+    Rows are replaced with DELETE and INSERT rather than TRUNCATE, so readers
+    keep seeing the previous rows until the transaction commits. Nothing is
+    done until every source table exists.
+
+    Returns:
+        bool: whether the table was rebuilt, in which case the caller runs
+            `notify_screener_refresh` once its transaction has committed
+    """
+    if not all(
+        get_column_types(connection, table, "tickers") for table in SCREENER_SOURCES
+    ):
+        return False
+
+    # A failed rebuild must not roll back the write it follows
+    try:
+        with connection.begin_nested():
+            if not get_column_types(connection, SCREENER_TABLE, "tickers"):
+                connection.execute(
+                    text(
+                        f"CREATE TABLE tickers.{SCREENER_TABLE} AS "
+                        f"{SCREENER_SELECT} WITH NO DATA"
+                    )
+                )
+                apply_table_schema(connection, SCREENER_TABLE, "tickers")
+
+            connection.execute(text(f"DELETE FROM tickers.{SCREENER_TABLE}"))
+            connection.execute(
+                text(f"INSERT INTO tickers.{SCREENER_TABLE} {SCREENER_SELECT}")
+            )
+        return True
+    except Exception as e:
+        print(f"Error refreshing the screener table: {e}")  # noqa: T201
+        return False
@@ -0,0 +1,303 @@
+"""In-memory columnar screener engine.
+
+The whole screener universe is a couple thousand rows, so every worker keeps
+one NumPy snapshot of `tickers.screener`, shared by all its sessions, and runs
+the ticker board's search, filters and sorts as vectorized masks and argsorts
+instead of querying PostgreSQL. The snapshot is also the worker's ticker
+catalog, read by every search bar. The snapshot is immutable and replaced by a
+single reference swap. It is reloaded after every screener rebuild committed
+in this process, and at least every `screener_snapshot_ttl` seconds to pick up
+rebuilds done by other processes.
+"""
+
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .database import read_sql_async
+from .scheduler import db_settings
+from .schema import SCREENER_METRICS
+from .screener import SCREENER_TABLE, on_screener_refresh
+from .ticker_index import TickerIndex
+
+# Columns returned for each board row
+BOARD_COLUMNS: Tuple[str, ...] = (
+    "symbol",
+    "current_price",
+    "accumulated_volume",
+    "pct_price_change",
+    "company_name",
+    "market_cap",
+)
+
+# Columns of the ticker catalog shown by the search bar, and how many of its
+# most traded tickers are flagged as trending
+CATALOG_COLUMNS: Tuple[str, ...] = (
+    "symbol",
+    "pct_price_change",
+    "accumulated_volume",
+    "industry",
+)
+TRENDING_TICKERS = 3
+
+# Columns whose values are counted for the board's checkbox filters
+FACET_COLUMNS: Tuple[str, ...] = ("industry", "exchange")
+HISTOGRAM_BUCKETS = 10
+
+
+@dataclass(frozen=True)
+class BoardPage:
+    """First rows of a board result, with its facets.
+
+    Facet counts are taken under every filter but the faceted one, so they
+    tell how many tickers selecting another value would add.
+
+    Attributes:
+        rows (List[Dict[str, Any]]): first matching rows, sorted
+        total (int): number of matching rows
+        counts (Dict[str, Dict[str, int]]): tickers per value of each facet column
+        histograms (Dict[str, Dict[str, List[float]]]): bucket `edges` and
+            `counts` of each metric
+    """
+
+    rows: List[Dict[str, Any]]
+    total: int
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    histograms: Dict[str, Dict[str, List[float]]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ScreenerSnapshot:
+    """Immutable columnar copy of the screener table."""
+
+    columns: Dict[str, np.ndarray]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ScreenerSnapshot":
+        columns = {}
+        for column in df.columns:
+            if pd.api.types.is_integer_dtype(df[column]):
+                columns[column] = df[column].to_numpy(dtype=np.int64)
+            elif pd.api.types.is_numeric_dtype(df[column]):
+                columns[column] = df[column].to_numpy(dtype=float, na_value=np.nan)
+            else:
+                columns[column] = df[column].fillna("").astype(str).to_numpy(dtype=str)
+        return cls(columns=columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["symbol"]) if "symbol" in self.columns else 0
+
+    @cached_property
+    def catalog(self) -> List[Dict[str, Any]]:
+        """Every ticker, most traded first, shared by all sessions."""
+        rows = self.sort(np.arange(len(self)), "accumulated_volume", descending=True)
+        return self.records(rows, CATALOG_COLUMNS)
+
+    @cached_property
+    def trending(self) -> Dict[str, int]:
+        """The most traded tickers."""
+        return {item["symbol"]: 1 for item in self.catalog[:TRENDING_TICKERS]}
+
+    @cached_property
+    def ticker_index(self) -> TickerIndex:
+        """Fuzzy index over the symbols and company names of the snapshot."""
+        return TickerIndex(
+            self.columns.get("symbol", np.array([], dtype=str)).tolist(),
+            self.columns.get("company_name", np.array([], dtype=str)).tolist(),
+            self.columns.get("accumulated_volume", np.array([], dtype=float)),
+        )
+
+    def search_mask(self, query: str) -> np.ndarray:
+        """Rows matching a ticker search, see `TickerIndex.search`."""
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.ticker_index.search(query)] = True
+        return mask
+
+    @cached_property
+    def categories(self) -> Dict[str, List[str]]:
+        """Sorted distinct values of each facet column."""
+        return {
+            column: [value for value in values.tolist() if value]
+            for column, (values, _) in self._facet_codes.items()
+        }
+
+    @cached_property
+    def _facet_codes(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Distinct values of each facet column and the code of every row."""
+        return {
+            column: np.unique(self.columns[column], return_inverse=True)
+            for column in FACET_COLUMNS
+            if column in self.columns
+        }
+
+    @cached_property
+    def _histogram_edges(self) -> Dict[str, np.ndarray]:
+        """Bucket edges of each metric, at quantiles of all its values."""
+        edges = {}
+        for metric in SCREENER_METRICS:
+            values = self.columns.get(metric)
+            if values is None or values.dtype.kind != "f":
+                continue
+            values = values[~np.isnan(values)]
+            if len(values):
+                quantiles = np.linspace(0, 1, HISTOGRAM_BUCKETS + 1)
+                edges[metric] = np.unique(np.quantile(values, quantiles))
+        return edges
+
+    def masks(
+        self,
+        search_query: str = "",
+        industries: Iterable[str] = (),
+        exchanges: Iterable[str] = (),
+        ranges: Dict[str, List[float]] | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """Return the mask of each active filter, by filtered column.
+
+        Raises:
+            KeyError: if a filter column does not exist
+        """
+        masks = {}
+        if search_query:
+            masks["symbol"] = self.search_mask(search_query)
+        if industries:
+            masks["industry"] = np.isin(self.columns["industry"], list(industries))
+        if exchanges:
+            masks["exchange"] = np.isin(self.columns["exchange"], list(exchanges))
+        for column, (low, high) in (ranges or {}).items():
+            values = self.columns[column]
+            masks[column] = (values >= low) & (values <= high)
+        return masks
+
+    def combine(self, masks: Dict[str, np.ndarray], skip: str = "") -> np.ndarray:
+        """AND the masks together, leaving out the one of column `skip`."""
+        mask = np.ones(len(self), dtype=bool)
+        for column, column_mask in masks.items():
+            if column != skip:
+                mask &= column_mask
+        return mask
+
+    def sort(self, rows: np.ndarray, sort_by: str, descending: bool) -> np.ndarray:
+        """Sort row positions by a column, with missing values last.
+
+        Raises:
+            KeyError: if the sort column does not exist
+        """
+        if not sort_by:
+            return rows
+        keys = self.columns[sort_by][rows]
+        order = np.argsort(keys, kind="stable")
+        if descending:
+            order = order[::-1]
+            if keys.dtype.kind == "f":
+                missing = np.isnan(keys[order])
+                order = np.concatenate([order[~missing], order[missing]])
+        return rows[order]
+
+    def select(
+        self, sort_by: str = "symbol", descending: bool = False, **filters
+    ) -> np.ndarray:
+        """Return the positions of the rows matching the filters of `masks`, sorted."""
+        rows = np.flatnonzero(self.combine(self.masks(**filters)))
+        return self.sort(rows, sort_by, descending)
+
+    def facets(
+        self, masks: Dict[str, np.ndarray]
+    ) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[str, List[float]]]]:
+        """Count tickers per facet value and metric bucket, each under every
+        filter but its own.
+        """
+        counts = {}
+        for column, (values, codes) in self._facet_codes.items():
+            per_value = np.bincount(
+                codes[self.combine(masks, skip=column)], minlength=len(values)
+            )
+            counts[column] = {
+                value: count
+                for value, count in zip(values.tolist(), per_value.tolist())
+                if value
+            }
+
+        histograms = {}
+        for metric, edges in self._histogram_edges.items():
+            values = self.columns[metric][self.combine(masks, skip=metric)]
+            per_bucket, _ = np.histogram(values[~np.isnan(values)], bins=edges)
+            histograms[metric] = {
+                "edges": edges.tolist(),
+                "counts": per_bucket.tolist(),
+            }
+        return counts, histograms
+
+    def records(
+        self, rows: np.ndarray, columns: Tuple[str, ...] = BOARD_COLUMNS
+    ) -> List[Dict[str, Any]]:
+        """Materialize the given rows as dicts, with None for missing values."""
+        output = []
+        for column in columns:
+            values = self.columns[column][rows]
+            if values.dtype.kind == "f":
+                output.append([None if v != v else v for v in values.tolist()])
+            else:
+                output.append(values.tolist())
+        return [dict(zip(columns, row)) for row in zip(*output)]
+
+    def filter(
+        self, columns: Tuple[str, ...] = BOARD_COLUMNS, **filters
+    ) -> List[Dict[str, Any]]:
+        """Return every board row matching the filters of `select`, sorted."""
+        return self.records(self.select(**filters), columns)
+
+    def page(
+        self,
+        limit: int,
+        sort_by: str = "symbol",
+        descending: bool = False,
+        columns: Tuple[str, ...] = BOARD_COLUMNS,
+        **filters,
+    ) -> BoardPage:
+        """Return the first `limit` matching rows, with the result's facets.
+
+        The filter masks are computed once for both, and only the returned
+        rows are materialized.
+        """
+        masks = self.masks(**filters)
+        rows = self.sort(np.flatnonzero(self.combine(masks)), sort_by, descending)
+        counts, histograms = self.facets(masks)
+        return BoardPage(
+            self.records(rows[:limit], columns), len(rows), counts, histograms
+        )
+
+
+_snapshot: ScreenerSnapshot | None = None
+
+
+async def load_snapshot() -> ScreenerSnapshot:
+    """Load a new snapshot of the screener table and swap it in."""
+    global _snapshot
+    snapshot = ScreenerSnapshot.from_frame(
+        await read_sql_async(f"SELECT * FROM tickers.{SCREENER_TABLE}")
+    )
+    _snapshot = snapshot
+    return snapshot
+
+
+async def get_snapshot() -> ScreenerSnapshot:
+    """Return the current snapshot, reloading it when missing or expired."""
+    snapshot = _snapshot
+    if (
+        snapshot is None
+        or time.monotonic() - snapshot.loaded_at > db_settings.screener_snapshot_ttl
+    ):
+        snapshot = await load_snapshot()
+    return snapshot
+
+
+@on_screener_refresh
+def invalidate_snapshot() -> None:
+    """Drop the snapshot so the next read loads the rebuilt screener."""
+    global _snapshot
+    _snapshot = None
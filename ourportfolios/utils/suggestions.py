@@ -0,0 +1,141 @@
+"""Typeahead ticker suggestions.
+
+`suggest` returns the top-k tickers of a search out of the shared ticker
+catalog, ranked by `TickerIndex.search`: symbol prefix matches first, then
+company name matches, then by edit distance, with ties going to the highest
+`accumulated_volume`. The latency of every lookup is recorded in
+`suggestion_latency`, available from `get_suggestion_metrics`.
+
+`debounced_suggest` runs the lookups of the search bar. It waits for typing
+to pause, and cancels the lookup still pending or running for the same client
+when a new one comes in.
+"""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
+
+from .scheduler import db_settings
+from .screener_engine import CATALOG_COLUMNS, get_snapshot
+
+# Upper bounds of the latency histogram buckets, in milliseconds. Slower
+# lookups fall in a last, unbounded bucket.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+)
+
+
+class LatencyHistogram:
+    """Latencies bucketed by upper bound, with their count, mean and max."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, milliseconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, milliseconds)] += 1
+            self.total += milliseconds
+            self.max = max(self.max, milliseconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, in milliseconds."""
+        with self._lock:
+            count = sum(self.counts)
+            seen = 0
+            for bound, bucket_count in zip(self.buckets, self.counts):
+                seen += bucket_count
+                if count and seen >= q * count:
+                    return bound
+            return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        with self._lock:
+            count = sum(self.counts)
+            return {
+                "count": count,
+                "mean_ms": self.total / count if count else 0.0,
+                "max_ms": self.max,
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "buckets": {
+                    f"le_{bound}": bucket_count
+                    for bound, bucket_count in zip(self.buckets + ("inf",), self.counts)
+                },
+            }
+
+
+suggestion_latency = LatencyHistogram()
+
+
+def get_suggestion_metrics() -> Dict[str, Any]:
+    """Return the latency histogram of suggestion lookups."""
+    return suggestion_latency.snapshot()
+
+
+async def suggest(query: str, limit: int | None = None) -> List[Dict[str, Any]]:
+    """Return the top `limit` tickers for a search, or the most traded ones
+    for an empty search.
+    """
+    limit = limit or db_settings.suggestion_limit
+    started = time.perf_counter()
+    try:
+        snapshot = await get_snapshot()
+        if not query.strip():
+            return snapshot.catalog[:limit]
+        return snapshot.records(
+            snapshot.ticker_index.search(query, limit), CATALOG_COLUMNS
+        )
+    finally:
+        suggestion_latency.record((time.perf_counter() - started) * 1000)
+
+
+# Pending lookup of each client, cancelled when the client sends a newer one
+_pending: Dict[str, asyncio.Task] = {}
+
+
+async def _delayed_suggest(query: str, delay: float) -> List[Dict[str, Any]]:
+    await asyncio.sleep(delay)
+    return await suggest(query)
+
+
+async def debounced_suggest(
+    client: str, query: str, delay: float | None = None
+) -> List[Dict[str, Any]] | None:
+    """Return the suggestions of a query once `delay` seconds passed without a
+    newer query from the same client, or None if a newer query came in.
+    """
+    delay = db_settings.suggestion_debounce if delay is None else delay
+    previous = _pending.get(client)
+    if previous is not None:
+        previous.cancel()
+
+    task = asyncio.ensure_future(_delayed_suggest(query, delay))
+    _pending[client] = task
+    try:
+        return await task
+    except asyncio.CancelledError:
+        # Superseded lookups return None, but a cancelled caller must stop
+        if asyncio.current_task().cancelling():
+            raise
+        return None
+    finally:
+        if _pending.get(client) is task:
+            del _pending[client]
@@ -0,0 +1,166 @@
+"""In-memory fuzzy index over ticker symbols and company names.
+
+Built once per screener snapshot, so once per ETL refresh. A search ranks, in
+this order:
+
+1. symbols starting with the query, shortest first
+2. company names with a word starting with each word of the query
+3. symbols made of the same letters as the query, then symbols one edit away
+   from it (transpositions included), when 1 and 2 are not enough
+
+Ties go to the most traded ticker. When nothing matches, symbols starting with
+the query's first letter are returned. Prefix lookups are binary searches over
+sorted keys. Fuzzy candidates are looked up by the query and its one-letter
+deletions in an index of the symbols and their own one-letter deletions, and
+only those are compared by edit distance. The query is cut to the longest
+symbol, so the work is bounded whatever its length.
+"""
+
+import heapq
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+# Name words found in more than this share of names ("CONG", "TY", ...) are
+# not indexed
+COMMON_WORD_SHARE = 0.05
+
+
+def normalize(value: str) -> str:
+    """Uppercase a string and strip its Vietnamese diacritics."""
+    value = value.upper().replace("Đ", "D")
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def deletions(value: str) -> Set[str]:
+    """The string and every string one deleted letter away from it."""
+    return {value} | {value[:i] + value[i + 1 :] for i in range(len(value))}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Whether one insertion, deletion, substitution or swap of adjacent
+    letters turns `a` into `b`.
+    """
+    if abs(len(a) - len(b)) > 1:
+        return False
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    if len(a) != len(b):
+        shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+        return shorter[start:] == longer[start + 1 :]
+    return (
+        a[start + 1 :] == b[start + 1 :]
+        or a[start : start + 2] == b[start : start + 2][::-1]
+        and a[start + 2 :] == b[start + 2 :]
+    )
+
+
+def prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """Bounds of the sorted keys starting with a prefix."""
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+
+class TickerIndex:
+    """Ranked fuzzy search over the rows of a screener snapshot."""
+
+    def __init__(
+        self, symbols: Sequence[str], names: Sequence[str], volumes: np.ndarray
+    ):
+        self.symbols = [normalize(symbol) for symbol in symbols]
+        self.volumes = np.nan_to_num(np.asarray(volumes, dtype=float), nan=-1.0)
+        self.max_length = max(map(len, self.symbols), default=0)
+
+        order = sorted(range(len(self.symbols)), key=self.symbols.__getitem__)
+        self._sorted_symbols = [self.symbols[row] for row in order]
+        self._symbol_rows = order
+
+        words = [set(normalize(name).split()) for name in names]
+        frequency: Dict[str, int] = defaultdict(int)
+        for name_words in words:
+            for word in name_words:
+                frequency[word] += 1
+        self._common_words = {
+            word
+            for word, count in frequency.items()
+            if count > COMMON_WORD_SHARE * len(words)
+        }
+        entries = sorted(
+            (word, row)
+            for row, name_words in enumerate(words)
+            for word in name_words - self._common_words
+        )
+        self._words = [word for word, _ in entries]
+        self._word_rows = [row for _, row in entries]
+
+        variants: Dict[str, List[int]] = defaultdict(list)
+        anagrams: Dict[str, List[int]] = defaultdict(list)
+        for row, symbol in enumerate(self.symbols):
+            for variant in deletions(symbol):
+                variants[variant].append(row)
+            anagrams["".join(sorted(symbol))].append(row)
+        self._variants = dict(variants)
+        self._anagrams = dict(anagrams)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _fuzzy(self, query: str) -> Dict[int, int]:
+        """Anagrams of the query, at distance 0, and symbols one edit away."""
+        matches = {row: 0 for row in self._anagrams.get("".join(sorted(query)), [])}
+        for variant in deletions(query):
+            for row in self._variants.get(variant, []):
+                if row not in matches and within_one_edit(query, self.symbols[row]):
+                    matches[row] = 1
+        return matches
+
+    def _name_rows(self, words: List[str]) -> Set[int]:
+        """Rows whose company name has a word starting with each query word."""
+        rows: Set[int] | None = None
+        for word in words:
+            if len(word) < 2 or word in self._common_words:
+                continue
+            start, end = prefix_range(self._words, word)
+            matched = set(self._word_rows[start:end])
+            rows = matched if rows is None else rows & matched
+        return rows or set()
+
+    def search(self, query: str, limit: int | None = None) -> List[int]:
+        """Return the rows matching a query, best first.
+
+        Fuzzy matches are only looked up when the exact ones do not fill
+        `limit`, or when there are none.
+
+        Args:
+            query (str): symbol or company name fragment
+            limit (int | None): most rows returned, all if None
+        """
+        words = normalize(query).split()
+        query = "".join(words)[: self.max_length]
+        if not query:
+            return []
+
+        ranks: Dict[int, Tuple[int, int, float]] = {}
+        start, end = prefix_range(self._sorted_symbols, query)
+        for row in self._symbol_rows[start:end]:
+            ranks[row] = (0, len(self.symbols[row]) - len(query), -self.volumes[row])
+        for row in self._name_rows(words):
+            ranks.setdefault(row, (1, 0, -self.volumes[row]))
+
+        enough = len(ranks) >= limit if limit is not None else bool(ranks)
+        if not enough and len(query) >= 2:
+            for row, distance in self._fuzzy(query).items():
+                ranks.setdefault(row, (2, distance, -self.volumes[row]))
+
+        if not ranks:
+            start, end = prefix_range(self._sorted_symbols, query[0])
+            for row in self._symbol_rows[start:end]:
+                ranks[row] = (3, 0, -self.volumes[row])
+
+        if limit is None:
+            return sorted(ranks, key=ranks.__getitem__)
+        return heapq.nsmallest(limit, ranks, key=ranks.__getitem__)